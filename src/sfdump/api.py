@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
@@ -21,6 +22,10 @@ _logger = logging.getLogger(__name__)
 # Ensure .env is loaded for library use as well (e.g., scripts importing SalesforceAPI)
 load_env_files(quiet=True)
 
+# Keep-alive connections per host; callers sharing one client should not run
+# more concurrent requests than this
+DEFAULT_POOL_MAXSIZE = 32
+
 
 # ----------------------------------------------------------------------
 # Configuration dataclass
@@ -65,8 +70,11 @@ class SFConfig:
 class SalesforceAPI:
     """Minimal Salesforce REST API client using OAuth client-credentials."""
 
-    def __init__(self, cfg: Optional[SFConfig] = None, pool_maxsize: int = 20) -> None:
+    def __init__(
+        self, cfg: Optional[SFConfig] = None, pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    ) -> None:
         self.cfg = cfg or SFConfig.from_env()
+        self.pool_maxsize = pool_maxsize
         self.session = requests.Session()
         adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
         self.session.mount("https://", adapter)
@@ -74,6 +82,8 @@ class SalesforceAPI:
         self.access_token: Optional[str] = None
         self.instance_url: Optional[str] = None
         self.api_version: Optional[str] = None
+        self._auth_lock = threading.Lock()
+        self._auth_state = threading.local()  # .active: this thread is logging in again
 
     # --------------------------- Public methods -----------------------
 
@@ -120,7 +130,9 @@ class SalesforceAPI:
         """
         yield from self.query_all_iter(soql)
 
-    def download_path_to_file(self, rel_path: str, target: str, chunk_size: int = 8192) -> int:
+    def download_path_to_file(
+        self, rel_path: str, target: str, chunk_size: int = 1024 * 1024
+    ) -> int:
         """Download a binary resource given a relative REST path and save to file.
 
         rel_path should start with '/', e.g.
@@ -139,7 +151,13 @@ class SalesforceAPI:
 
         total = 0
         # Use the authenticated session (Authorization header already set in connect())
-        with self.session.get(url, stream=True) as resp:
+        token = self.access_token
+        resp = self.session.get(url, stream=True)
+        if resp.status_code == 401:
+            resp.close()  # Not read either way; don't hold its connection during login
+            if self._reauthenticate(token):
+                resp = self.session.get(url, stream=True)
+        with resp:
             resp.raise_for_status()
             with open(target, "wb") as f:
                 for chunk in resp.iter_content(chunk_size=chunk_size):
@@ -152,6 +170,30 @@ class SalesforceAPI:
 
     # --------------------------- Internal helpers --------------------
 
+    def _reauthenticate(self, stale_token: Optional[str]) -> bool:
+        """Log in again after ``stale_token`` was rejected (HTTP 401).
+
+        Concurrent callers share one login: if another thread already
+        replaced the token, the new one is used as-is. Returns False when
+        the token came from configuration, since logging in again would
+        only hand back the same token, or when the 401 came from a request
+        made by the login itself, so a token that keeps failing raises
+        instead of retrying forever.
+        """
+        if self.cfg.access_token and self.cfg.instance_url:
+            return False
+        if getattr(self._auth_state, "active", False):
+            return False
+        with self._auth_lock:
+            if self.access_token == stale_token:
+                _logger.info("Salesforce session expired, re-authenticating")
+                self._auth_state.active = True
+                try:
+                    self.connect()
+                finally:
+                    self._auth_state.active = False
+        return True
+
     def _login_via_auth_flow(self) -> None:
         """Dispatch to the configured auth flow."""
         if self.cfg.auth_flow == "client_credentials":
@@ -232,11 +274,15 @@ class SalesforceAPI:
         timeout: float = 30.0,
     ) -> requests.Response:
         """Generic request with retry and logging."""
+        token = self.access_token if auth_required else None
         headers: Dict[str, str] = {}
-        if auth_required and self.access_token:
-            headers["Authorization"] = f"Bearer {self.access_token}"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
 
-        for attempt in range(1, retries + 1):
+        reauthenticated = False
+        attempt = 0
+        while attempt < retries:
+            attempt += 1
             try:
                 r = self.session.request(
                     method,
@@ -263,6 +309,15 @@ class SalesforceAPI:
             if r.status_code < 400:
                 return r
 
+            # Expired token: log in again once and repeat the request
+            if r.status_code == 401 and auth_required and not reauthenticated:
+                reauthenticated = True
+                if self._reauthenticate(token):
+                    token = self.access_token
+                    headers["Authorization"] = f"Bearer {token}"
+                    attempt -= 1
+                    continue
+
             # Retryable HTTP errors
             if r.status_code in (429, 500, 502, 503, 504) and attempt < retries:
                 _logger.warning(
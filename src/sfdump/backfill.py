@@ -13,8 +13,9 @@ import logging
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from tqdm import tqdm
 
@@ -51,6 +52,76 @@ def _safe_filename(stem: str, ext: str) -> str:
     return f"{stem}.{ext}" if ext else stem
 
 
+def _is_missing_file_row(row: dict) -> bool:
+    """Return True if an index row is a File with no local_path and a 069/068 ID."""
+    if row.get("file_source") != "File" or (row.get("local_path") or "") != "":
+        return False
+    return (row.get("file_id") or "").startswith(("069", "068"))
+
+
+def _iter_csv_columns(path: Path, columns: tuple[str, ...]) -> Iterator[tuple[str, ...]]:
+    """
+    Yield just the named columns of each CSV row, as tuples.
+
+    Avoids building a dict per row when only a few fields are needed.
+    Columns absent from the header (or short rows) read as "".
+    """
+    with path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header) + 1  # Extra slot is the "" for absent columns
+        getter = itemgetter(*(header.index(c) if c in header else len(header) for c in columns))
+        for row in reader:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            yield getter(row) if len(columns) > 1 else (getter(row),)
+
+
+def iter_missing_in_index(index_path: Path) -> Iterator[dict]:
+    """
+    Stream rows with blank local_path from master_documents_index.csv.
+
+    Same filter as :func:`load_missing_from_index`, but yields rows one at a
+    time so callers never hold the full index in memory.
+
+    Args:
+        index_path: Path to master_documents_index.csv
+
+    Yields:
+        Row dictionaries that need backfilling
+    """
+    if not index_path.exists():
+        return
+
+    with index_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if _is_missing_file_row(row):
+                yield row
+
+
+def count_missing_in_index(index_path: Path) -> int:
+    """
+    Count rows with blank local_path in master_documents_index.csv.
+
+    Streams the index so only one row is held in memory at a time.
+
+    Args:
+        index_path: Path to master_documents_index.csv
+
+    Returns:
+        Number of rows that need backfilling
+    """
+    if not index_path.exists():
+        return 0
+    return sum(
+        1
+        for source, local_path, file_id in _iter_csv_columns(
+            index_path, ("file_source", "local_path", "file_id")
+        )
+        if source == "File" and local_path == "" and file_id.startswith(("069", "068"))
+    )
+
+
 def load_missing_from_index(index_path: Path) -> list[dict]:
     """
     Load rows with blank local_path from master_documents_index.csv.
@@ -66,24 +137,7 @@ def load_missing_from_index(index_path: Path) -> list[dict]:
     Returns:
         List of row dictionaries that need backfilling
     """
-    if not index_path.exists():
-        return []
-
-    with index_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    missing = [
-        r
-        for r in rows
-        if (r.get("file_source") == "File")
-        and (r.get("local_path") or "") == ""
-        and (
-            (r.get("file_id") or "").startswith("069") or (r.get("file_id") or "").startswith("068")
-        )
-    ]
-
-    return missing
+    return list(iter_missing_in_index(index_path))
 
 
 def resolve_content_version_id(api: SalesforceAPI, content_document_id: str) -> str | None:
@@ -200,15 +254,7 @@ def run_backfill(
             rows_by_id[file_id] = row
 
     # Filter for missing files
-    missing = [
-        r
-        for r in all_rows
-        if (r.get("file_source") == "File")
-        and (r.get("local_path") or "") == ""
-        and (
-            (r.get("file_id") or "").startswith("069") or (r.get("file_id") or "").startswith("068")
-        )
-    ]
+    missing = [r for r in all_rows if _is_missing_file_row(r)]
 
     total_missing = len(missing)
     if total_missing == 0:
@@ -331,6 +377,10 @@ def run_backfill(
             else:
                 pbar = as_completed(futures)
 
+            # Report on a precomputed threshold rather than a modulo per file
+            total_downloads = len(futures)
+            interval = max(progress_interval, 1)
+            next_report = min(interval, total_downloads)
             processed = 0
             for fut in pbar:
                 row, abs_path, rel_path = futures[fut]
@@ -346,10 +396,10 @@ def run_backfill(
                     _logger.debug("Failed to download %s: %s", row.get("file_id"), e)
 
                 processed += 1
-                if progress_callback and (
-                    processed % progress_interval == 0 or processed == len(futures)
-                ):
-                    progress_callback(processed, len(futures), downloaded, failed)
+                if processed == next_report:
+                    next_report = min(next_report + interval, total_downloads)
+                    if progress_callback:
+                        progress_callback(processed, total_downloads, downloaded, failed)
 
             if show_progress and hasattr(pbar, "close"):
                 pbar.close()
@@ -47,7 +47,7 @@ pause
 @click.option("--check", is_flag=True, help="Only check for updates, don't install.")
 def upgrade_cmd(check: bool) -> None:
     """Check for updates and upgrade sfdump from PyPI."""
-    available, current, latest = is_update_available()
+    available, current, latest = is_update_available(use_cache=False)
 
     click.echo(f"Current version: {current}")
 
@@ -17,6 +17,9 @@ _logger = logging.getLogger(__name__)
 # Windows MAX_PATH is 260, but we use 250 to leave buffer for edge cases
 _WINDOWS_MAX_PATH = 250
 
+# Parallel binary downloads per dump_attachments / dump_content_versions call
+DEFAULT_MAX_WORKERS = 16
+
 
 def _order_and_chunk_rows(rows: List[dict], *, kind: str) -> List[dict]:
     """Optionally reorder and slice rows based on env vars.
@@ -183,7 +186,7 @@ def dump_content_versions(
     out_dir: str,
     *,
     where: Optional[str] = None,
-    max_workers: int = 16,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> Dict[str, int | str | None]:
     """Download latest ContentVersion binaries + write metadata and links CSVs.
 
@@ -423,7 +426,7 @@ def dump_attachments(
     out_dir: str,
     *,
     where: Optional[str] = None,
-    max_workers: int = 16,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> Dict[str, int | str | None]:
     """Download legacy Attachment binaries + write metadata CSV.
 
@@ -221,7 +221,7 @@ class InventoryManager:
 
     def _check_csv_objects(self) -> CsvCategory:
         """Check CSV exports against ESSENTIAL_OBJECTS list."""
-        from .orchestrator import ESSENTIAL_OBJECTS
+        from .orchestrator import ESSENTIAL_OBJECTS, ESSENTIAL_OBJECTS_SET
 
         cat = CsvCategory()
 
@@ -237,7 +237,7 @@ class InventoryManager:
         cat.found_objects = sorted(actual_csvs)
         cat.found_count = len(actual_csvs)
 
-        expected_set = set(ESSENTIAL_OBJECTS)
+        expected_set = ESSENTIAL_OBJECTS_SET
         cat.missing_objects = sorted(expected_set - actual_csvs)
         cat.extra_objects = sorted(actual_csvs - expected_set)
 
@@ -14,24 +14,49 @@ All UI output goes through the unified ProgressReporter for consistency.
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import functools
 import logging
 import os
 import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 from .exceptions import RateLimitError
 from .progress import ProgressReporter
 
 _logger = logging.getLogger(__name__)
 
+__all__ = [
+    "ESSENTIAL_OBJECTS",
+    "ESSENTIAL_OBJECTS_LIGHT",
+    "ESSENTIAL_OBJECTS_LIGHT_SET",
+    "ESSENTIAL_OBJECTS_SET",
+    "FILE_INDEX_OBJECTS",
+    "FILE_INDEX_OBJECTS_LIGHT",
+    "FILE_INDEX_OBJECTS_SET",
+    "ExportProgress",
+    "ExportResult",
+    "ensure_database",
+    "find_latest_export",
+    "get_default_export_path",
+    "invalidate_api",
+    "invalidate_export_cache",
+    "launch_viewer",
+    "run_full_export",
+]
+
 
 # Lightweight objects for CI testing - core financial data only
 # Used when SF_E2E_LIGHT=true to keep exports small (~1-2GB)
-ESSENTIAL_OBJECTS_LIGHT = [
+ESSENTIAL_OBJECTS_LIGHT: tuple[str, ...] = (
     "Account",
     "Contact",
     "Opportunity",
@@ -40,10 +65,10 @@ ESSENTIAL_OBJECTS_LIGHT = [
     "c2g__codaTransaction__c",
     "c2g__codaPurchaseInvoice__c",
     "User",
-]
+)
 
 # Essential objects for finance users - covers CRM, Finance, and HR
-ESSENTIAL_OBJECTS = [
+ESSENTIAL_OBJECTS: tuple[str, ...] = (
     # Core CRM
     "Account",
     "Contact",
@@ -94,10 +119,10 @@ ESSENTIAL_OBJECTS = [
     "JobApplication__c",
     "HR_Activity__c",
     "Salary_History__c",
-]
+)
 
 # Objects to index files by (for linking documents to records)
-FILE_INDEX_OBJECTS = [
+FILE_INDEX_OBJECTS: tuple[str, ...] = (
     "Opportunity",
     "Account",
     "Project__c",
@@ -109,7 +134,17 @@ FILE_INDEX_OBJECTS = [
     "pse__Proj__c",
     "pse__Expense_Report__c",
     "Engineer__c",
-]
+)
+
+# Set mirrors for O(1) membership checks
+ESSENTIAL_OBJECTS_LIGHT_SET = frozenset(ESSENTIAL_OBJECTS_LIGHT)
+ESSENTIAL_OBJECTS_SET = frozenset(ESSENTIAL_OBJECTS)
+FILE_INDEX_OBJECTS_SET = frozenset(FILE_INDEX_OBJECTS)
+
+# Light mode only indexes files for objects it actually exports
+FILE_INDEX_OBJECTS_LIGHT: tuple[str, ...] = tuple(
+    obj for obj in FILE_INDEX_OBJECTS if obj in ESSENTIAL_OBJECTS_LIGHT_SET
+)
 
 
 @dataclass
@@ -137,18 +172,383 @@ class ExportResult:
     error: str | None = None
 
 
+# find_latest_export results are reused for this many seconds
+_EXPORT_CACHE_TTL = 30
+
+
+@functools.lru_cache(maxsize=4)
+def _default_export_path_for(today: str) -> Path:
+    return Path(f"./exports/export-{today}")
+
+
 def get_default_export_path() -> Path:
     """Get the default export path for today."""
-    today = date.today().isoformat()
-    return Path(f"./exports/export-{today}")
+    return _default_export_path_for(date.today().isoformat())
+
+
+def _api_cache_ttl() -> int:
+    """Seconds a connected SalesforceAPI is reused (SFDUMP_API_CACHE_TTL, default 3600)."""
+    try:
+        return max(1, int(os.environ.get("SFDUMP_API_CACHE_TTL", "3600")))
+    except ValueError:
+        return 3600
+
+
+# (ttl bucket, connected client) shared by exports in this process
+_api_holder: tuple[int, object] | None = None
+_api_lock = threading.Lock()
+
+
+def _get_api():
+    """Return a connected SalesforceAPI, reusing the process-wide client if possible.
+
+    The client is kept for one TTL bucket. An expired token is not probed
+    for here: SalesforceAPI re-authenticates on the first request that
+    comes back 401.
+    """
+    global _api_holder
+    from .api import SalesforceAPI
+
+    bucket = int(time.time()) // _api_cache_ttl()
+    with _api_lock:
+        held = _api_holder
+        if held is not None and held[0] == bucket:
+            return held[1]
+        api = SalesforceAPI()
+        api.connect()
+        _api_holder = (bucket, api)
+        return api
+
+
+def invalidate_api() -> None:
+    """Forget the cached SalesforceAPI so the next export reconnects."""
+    global _api_holder
+    with _api_lock:
+        _api_holder = None
+
+
+# PRAGMA overrides for the SQLite build, enabled with SFDUMP_FAST_SQLITE=1.
+# The database is always rebuildable from the exported CSVs, so durability
+# can be traded for speed while it is being (re)built.
+_FAST_SQLITE_ENV = {
+    "SFDUMP_SQLITE_PRAGMA_JOURNAL": "WAL",
+    "SFDUMP_SQLITE_PRAGMA_SYNC": "OFF",
+    "SFDUMP_SQLITE_PRAGMA_TEMP": "MEMORY",
+    "SFDUMP_SQLITE_PRAGMA_CACHE": "-200000",  # ~200 MB
+}
+
+
+@contextlib.contextmanager
+def _env_overrides(updates: dict[str, str | None]) -> Iterator[None]:
+    """Set (or unset, for None) env vars, restoring previous values on exit."""
+    saved = {k: os.environ.get(k) for k in updates}
+    try:
+        for key, value in updates.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def _chunk_env(light: bool, max_files: int | None) -> Iterator[None]:
+    """
+    Set or clear the file-chunking env vars for the duration of the file step.
+
+    Light mode limits the download to a single chunk of ``max_files`` (default
+    50). Otherwise any stale chunking vars are cleared so the export is
+    complete. The previous values are restored on exit, even on error.
+    """
+    updates: dict[str, str | None]
+    if light:
+        updates = {
+            "SFDUMP_FILES_CHUNK_TOTAL": str(max_files or 50),
+            "SFDUMP_FILES_CHUNK_INDEX": "1",
+        }
+    else:
+        # Clear any stale chunking env vars
+        if os.environ.get("SFDUMP_FILES_CHUNK_TOTAL"):
+            _logger.warning(
+                "Clearing stale SFDUMP_FILES_CHUNK_TOTAL=%s env var",
+                os.environ.get("SFDUMP_FILES_CHUNK_TOTAL"),
+            )
+        updates = {"SFDUMP_FILES_CHUNK_TOTAL": None, "SFDUMP_FILES_CHUNK_INDEX": None}
+    with _env_overrides(updates):
+        yield
 
 
-def _load_csv_rows(csv_path: Path) -> list[dict]:
-    """Load rows from a CSV file."""
-    if not csv_path.exists():
-        return []
-    with csv_path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+def _sqlite_build_env() -> contextlib.AbstractContextManager[None]:
+    """Apply _FAST_SQLITE_ENV around a database build if SFDUMP_FAST_SQLITE=1."""
+    if os.environ.get("SFDUMP_FAST_SQLITE") == "1":
+        return _env_overrides(dict(_FAST_SQLITE_ENV))
+    return contextlib.nullcontext()
+
+
+def _build_database(build: Callable[..., Path], export_path: Path, database_path: Path) -> None:
+    """Build the SQLite database from the export, under _sqlite_build_env()."""
+    with _sqlite_build_env():
+        build(str(export_path), str(database_path), overwrite=True)
+
+
+def _index_path_counts(index_path: Path) -> tuple[int, int]:
+    """Return (downloaded, missing) row counts from master_documents_index.csv."""
+    if not index_path.exists():
+        return 0, 0
+
+    downloaded = 0
+    total = 0
+    # Plain csv.reader with a fixed column index: no per-row dict is built
+    with index_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            lp = header.index("local_path")
+        except ValueError:
+            return 0, sum(1 for _ in reader)
+        for row in reader:
+            total += 1
+            if lp < len(row) and row[lp].strip():
+                downloaded += 1
+    return downloaded, total - downloaded
+
+
+# Above this fraction of index rows, rebuilding the master index beats patching it
+_MASTER_INDEX_PATCH_LIMIT = 0.25
+
+
+def _recovered_index_paths(
+    attachment_rows: list[dict], content_version_rows: list[dict]
+) -> dict[str, str]:
+    """Map master-index file_id -> path for rows the retry pass recovered.
+
+    Attachments are indexed by their own Id; Files by ContentDocumentId.
+    """
+    updates: dict[str, str] = {}
+    for rows, id_field in (
+        (attachment_rows, "Id"),
+        (content_version_rows, "ContentDocumentId"),
+    ):
+        for r in rows:
+            if r.get("retry_status") == "recovered" and r.get(id_field) and r.get("path"):
+                updates[r[id_field]] = r["path"]
+    return updates
+
+
+def _patch_master_index(index_path: Path, updates: dict[str, str]) -> int:
+    """
+    Fill blank local_path cells in master_documents_index.csv from {file_id: path}.
+
+    The index is streamed through a temp file and replaced atomically, so
+    only the update map is held in memory.
+
+    Returns:
+        Number of index rows updated
+    """
+    from .command_docs_index import _normalize_export_rel_path
+
+    tmp = index_path.with_suffix(".csv.tmp")
+    updated = 0
+    try:
+        with (
+            index_path.open(newline="", encoding="utf-8") as src,
+            tmp.open("w", newline="", encoding="utf-8") as dst,
+        ):
+            reader = csv.DictReader(src)
+            fieldnames = reader.fieldnames or []
+            if "file_id" not in fieldnames or "local_path" not in fieldnames:
+                return 0
+            writer = csv.DictWriter(dst, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in reader:
+                path = updates.get(row.get("file_id") or "")
+                if path and not (row.get("local_path") or "").strip():
+                    row["local_path"] = _normalize_export_rel_path(path)
+                    updated += 1
+                writer.writerow(row)
+
+        if updated:
+            tmp.replace(index_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    return updated
+
+
+_MAX_OBJECT_ATTEMPTS = 3
+
+
+def _is_transient_error(exc: Exception) -> bool:
+    """Return True for network errors worth retrying (timeouts, dropped connections)."""
+    import requests
+
+    return isinstance(
+        exc,
+        (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError),
+    )
+
+
+def _csv_workers() -> int:
+    """Number of parallel per-object API jobs (SFDUMP_CSV_WORKERS, default 6)."""
+    try:
+        return max(1, int(os.environ.get("SFDUMP_CSV_WORKERS", "6")))
+    except ValueError:
+        return 6
+
+
+def _background_csv_workers(pool_size: int, download_workers: int) -> int:
+    """
+    CSV export workers that fit beside Step 2's downloads on one session.
+
+    Both share the client's connection pool; past its size urllib3 opens
+    and throws away extra connections, so the CSV side gets what is left.
+    """
+    return max(1, min(_csv_workers(), pool_size - download_workers))
+
+
+def _export_objects(
+    dump: Callable[[str], object],
+    objects: tuple[str, ...],
+    on_done: Callable[[int], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    max_workers: int | None = None,
+    stop: threading.Event | None = None,
+) -> tuple[int, list[str]]:
+    """
+    Export objects in parallel through a job queue, requeueing transient failures.
+
+    Object exports are network-bound, so up to ``max_workers`` run at once.
+    Objects that hit a transient error are pushed to the back of the queue and
+    retried (with exponential backoff) up to ``_MAX_OBJECT_ATTEMPTS`` times.
+    Any other error marks the object as failed. RateLimitError cancels the
+    queued work and propagates so the caller can stop the export.
+
+    Args:
+        dump: Callable that exports a single object by name
+        objects: Object names to export
+        on_done: Optional callback(completed) called each time an object finishes
+        sleep: Sleep function used for backoff (injectable for tests)
+        max_workers: Parallel exports (default from SFDUMP_CSV_WORKERS)
+        stop: Optional event; once set, queued objects are dropped and only
+            in-flight exports are awaited
+
+    Returns:
+        (number exported, list of object names that failed, in input order)
+    """
+    pending = deque(objects)
+    attempts: Counter[str] = Counter()
+    exported = 0
+    failed: list[str] = []
+    completed = 0
+
+    def attempt(obj_name: str, n: int) -> None:
+        if n > 1:
+            sleep(2 ** (n - 1))
+        _logger.debug("Exporting %s...", obj_name)
+        dump(obj_name)
+
+    workers = max_workers or _csv_workers()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    in_flight: dict[Future, str] = {}
+    try:
+        while pending or in_flight:
+            if stop is not None and stop.is_set():
+                pending.clear()
+            while pending and len(in_flight) < workers:
+                obj_name = pending.popleft()
+                attempts[obj_name] += 1
+                in_flight[executor.submit(attempt, obj_name, attempts[obj_name])] = obj_name
+
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                obj_name = in_flight.pop(fut)
+                try:
+                    fut.result()
+                    exported += 1
+                except RateLimitError:
+                    raise  # Re-raise to stop the export
+                except Exception as e:
+                    if _is_transient_error(e) and attempts[obj_name] < _MAX_OBJECT_ATTEMPTS:
+                        _logger.debug(
+                            "Transient error exporting %s (attempt %d/%d), requeueing: %s",
+                            obj_name,
+                            attempts[obj_name],
+                            _MAX_OBJECT_ATTEMPTS,
+                            e,
+                        )
+                        pending.append(obj_name)
+                        continue
+                    failed.append(obj_name)
+                    _logger.debug("Failed to export %s: %s", obj_name, e)
+
+                completed += 1
+                if on_done:
+                    on_done(completed)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    order = {name: i for i, name in enumerate(objects)}
+    failed.sort(key=order.__getitem__)
+    return exported, failed
+
+
+class _ProgressRelay:
+    """Forward completion counts from a background job to a progress bar attached later."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._bar = None
+
+    def __call__(self, completed: int) -> None:
+        with self._lock:
+            self._completed = completed
+            if self._bar is not None:
+                self._bar.update(completed)
+
+    def attach(self, bar) -> None:
+        """Start forwarding to bar, catching it up with work already done."""
+        with self._lock:
+            self._bar = bar
+            bar.update(self._completed)
+
+    def detach(self) -> None:
+        with self._lock:
+            self._bar = None
+
+
+def _build_file_indexes(
+    build: Callable[[str], object],
+    objects: tuple[str, ...],
+    max_workers: int | None = None,
+) -> None:
+    """
+    Build per-object file indexes in parallel.
+
+    Each object writes its own index CSV, so the SOQL queries can overlap.
+    Per-object errors are ignored (the object may not have files);
+    RateLimitError cancels the remaining work and propagates.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers or _csv_workers())
+    try:
+        futures = {executor.submit(build, obj_name): obj_name for obj_name in objects}
+        for fut in as_completed(futures):
+            try:
+                fut.result()
+            except RateLimitError:
+                raise  # Re-raise to stop the export
+            except Exception as e:
+                _logger.debug("No files index for %s: %s", futures[fut], e)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 def run_full_export(
@@ -173,10 +573,22 @@ def run_full_export(
     Returns:
         ExportResult with summary of what was exported
     """
-    # Import here to avoid circular imports and allow graceful failure
-    from .api import SalesforceAPI
+    # Import here to avoid circular imports and allow graceful failure.
+    # All pipeline stages are bound once up front; only the optional invoice
+    # PDF step imports lazily.
+    from .api import DEFAULT_POOL_MAXSIZE
+    from .backfill import count_missing_in_index, run_backfill
+    from .command_docs_index import _build_master_index
+    from .command_files import build_files_index
     from .dumper import dump_object_to_csv
+    from .files import DEFAULT_MAX_WORKERS as FILE_WORKERS
     from .files import dump_attachments, dump_content_versions
+    from .retry import (
+        merge_recovered_into_metadata,
+        retry_missing_attachments,
+        retry_missing_content_versions,
+    )
+    from .verify import verify_attachments_rows, verify_content_versions_rows
     from .viewer.db_builder import build_sqlite_from_export
 
     # Create unified progress reporter - single source of truth for UI
@@ -194,6 +606,8 @@ def run_full_export(
     objects_exported = 0
     objects_failed: list[str] = []
     database_path: Path | None = None
+    # (downloaded, missing) from the master index, reused by the summary
+    index_counts: tuple[int, int] | None = None
 
     # Header
     ui.header("SF Data Export")
@@ -208,8 +622,7 @@ def run_full_export(
 
     try:
         with ui.spinner("Connecting"):
-            api = SalesforceAPI()
-            api.connect()
+            api = _get_api()
     except Exception as e:
         ui.step_error(str(e))
         error_msg = str(e)
@@ -224,6 +637,7 @@ def run_full_export(
             ui.blank()
             ui.info("See: https://github.com/ksteptoe/sfdump#setup")
             ui.blank()
+        ui.flush()
         return ExportResult(
             success=False,
             export_path=export_path,
@@ -235,60 +649,66 @@ def run_full_export(
             error=f"Authentication failed: {e}",
         )
 
-    # Create export directories
+    # Create export directories (only the root needs a parents walk)
     export_path.mkdir(parents=True, exist_ok=True)
     csv_dir = export_path / "csv"
-    csv_dir.mkdir(exist_ok=True)
     links_dir = export_path / "links"
-    links_dir.mkdir(exist_ok=True)
     meta_dir = export_path / "meta"
-    meta_dir.mkdir(exist_ok=True)
+    for sub_dir in (csv_dir, links_dir, meta_dir):
+        with contextlib.suppress(FileExistsError):
+            os.mkdir(sub_dir)
 
     # =========================================================================
     # Step 2: Export files (Attachments + ContentVersions)
     # =========================================================================
+    # Step 3's CSV export uses SOQL paging, disjoint from Step 2's binary
+    # downloads, so it starts now in the background. It prints nothing until
+    # Step 3 attaches its progress bar, leaving the console to Step 2. Both
+    # share one session, so together they stay within its connection pool.
+    objects_to_export = ESSENTIAL_OBJECTS_LIGHT if light else ESSENTIAL_OBJECTS
+    csv_progress = _ProgressRelay()
+    csv_stop = threading.Event()
+    csv_pool = ThreadPoolExecutor(max_workers=1)
+    csv_future = csv_pool.submit(
+        _export_objects,
+        lambda obj_name: dump_object_to_csv(api, obj_name, str(csv_dir)),
+        objects_to_export,
+        on_done=csv_progress,
+        max_workers=_background_csv_workers(
+            getattr(api, "pool_maxsize", DEFAULT_POOL_MAXSIZE), FILE_WORKERS
+        ),
+        stop=csv_stop,
+    )
+    csv_pool.shutdown(wait=False)
+
     ui.step_start(2, total_steps, "Exporting files (Attachments + Documents)")
     if progress_callback:
         progress_callback(ExportProgress(2, total_steps, "Exporting files"))
 
     try:
-        # Handle chunking env vars for light mode
-        if light:
-            file_limit = max_files or 50
-            os.environ["SFDUMP_FILES_CHUNK_TOTAL"] = str(file_limit)
-            os.environ["SFDUMP_FILES_CHUNK_INDEX"] = "1"
-            ui.step_done(f"light mode (~{file_limit} files)")
-        else:
-            # Clear any stale chunking env vars
-            if os.environ.get("SFDUMP_FILES_CHUNK_TOTAL"):
-                _logger.warning(
-                    "Clearing stale SFDUMP_FILES_CHUNK_TOTAL=%s env var",
-                    os.environ.get("SFDUMP_FILES_CHUNK_TOTAL"),
-                )
-            os.environ.pop("SFDUMP_FILES_CHUNK_TOTAL", None)
-            os.environ.pop("SFDUMP_FILES_CHUNK_INDEX", None)
-            ui.step_done()
-
-        # Attachments (legacy)
-        ui.substep_header("Attachments (legacy):")
-        att_stats = dump_attachments(api, str(export_path))
-        att_count = att_stats.get("count", 0)
-
-        # Documents (ContentVersion)
-        ui.substep_header("Documents (ContentVersion):")
-        cv_stats = dump_content_versions(api, str(export_path))
-        cv_count = cv_stats.get("count", 0)
+        # Chunking env vars are set (light mode) or cleared for this step only
+        with _chunk_env(light, max_files):
+            if light:
+                ui.step_done(f"light mode (~{max_files or 50} files)")
+            else:
+                ui.step_done()
+
+            # Attachments (legacy)
+            ui.substep_header("Attachments (legacy):")
+            att_stats = dump_attachments(api, str(export_path))
+            att_count = att_stats.get("count", 0)
+
+            # Documents (ContentVersion)
+            ui.substep_header("Documents (ContentVersion):")
+            cv_stats = dump_content_versions(api, str(export_path))
+            cv_count = cv_stats.get("count", 0)
 
         files_exported = att_count + cv_count
         ui.blank()
         ui.substep(f"File export complete: {files_exported:,} total files indexed")
 
-        # Clean up env vars
-        if light:
-            os.environ.pop("SFDUMP_FILES_CHUNK_TOTAL", None)
-            os.environ.pop("SFDUMP_FILES_CHUNK_INDEX", None)
-
-    except RateLimitError:
+    except (RateLimitError, KeyboardInterrupt):
+        csv_stop.set()  # Don't keep exporting CSVs in the background
         raise  # Re-raise to stop the export
     except Exception as e:
         ui.step_error(str(e))
@@ -302,22 +722,15 @@ def run_full_export(
     if progress_callback:
         progress_callback(ExportProgress(3, total_steps, "Exporting CSVs"))
 
-    objects_to_export = ESSENTIAL_OBJECTS_LIGHT if light else ESSENTIAL_OBJECTS
     total_objects = len(objects_to_export)
     ui.step_done(f"{total_objects} objects")
 
     with ui.progress_bar("Exporting", total=total_objects) as pb:
-        for i, obj_name in enumerate(objects_to_export):
-            try:
-                _logger.info(f"Exporting {obj_name}...")
-                dump_object_to_csv(api, obj_name, str(csv_dir))
-                objects_exported += 1
-            except RateLimitError:
-                raise  # Re-raise to stop the export
-            except Exception as e:
-                objects_failed.append(obj_name)
-                _logger.debug(f"Failed to export {obj_name}: {e}")
-            pb.update(i + 1)
+        csv_progress.attach(pb)
+        try:
+            objects_exported, objects_failed = csv_future.result()
+        finally:
+            csv_progress.detach()
 
     if objects_failed:
         ui.complete(f"{objects_exported} CSV files exported, {len(objects_failed)} unavailable")
@@ -332,23 +745,19 @@ def run_full_export(
         progress_callback(ExportProgress(4, total_steps, "Building indexes"))
 
     docs_missing_path = 0
+    index_rows = 0  # Master index size, reused by Step 7 to choose patch vs rebuild
     try:
-        from .command_docs_index import _build_master_index
-        from .command_files import build_files_index
-
         ui.step_done()
 
         with ui.spinner("Building file indexes"):
-            for obj_name in FILE_INDEX_OBJECTS:
-                try:
-                    build_files_index(api, obj_name, str(export_path))
-                except RateLimitError:
-                    raise  # Re-raise to stop the export
-                except Exception:
-                    pass  # Object may not have files
+            _build_file_indexes(
+                lambda obj_name: build_files_index(api, obj_name, str(export_path)),
+                FILE_INDEX_OBJECTS_LIGHT if light else FILE_INDEX_OBJECTS,
+            )
 
         with ui.spinner("Building master index"):
             _, docs_with_path, docs_missing_path = _build_master_index(export_path)
+            index_rows = docs_with_path + docs_missing_path
 
         if docs_missing_path > 0:
             _logger.info(
@@ -427,17 +836,30 @@ def run_full_export(
     if progress_callback:
         progress_callback(ExportProgress(6, total_steps, "Building database"))
 
-    try:
-        database_path = meta_dir / "sfdata.db"
-
-        with ui.spinner("Creating SQLite database"):
-            build_sqlite_from_export(str(export_path), str(database_path), overwrite=True)
-    except RateLimitError:
-        raise  # Re-raise to stop the export
-    except Exception as e:
-        ui.step_error(str(e))
-        _logger.exception("Database build failed")
-        database_path = None
+    # The build runs in the background while Step 7 verifies downloads, which
+    # only reads its inputs. It is joined before recovery rewrites any of them
+    # (metadata merge, master index patch, backfill).
+    database_path = meta_dir / "sfdata.db"
+    db_pool = ThreadPoolExecutor(max_workers=1)
+    db_future: Future[None] | None = db_pool.submit(
+        _build_database, build_sqlite_from_export, export_path, database_path
+    )
+    db_pool.shutdown(wait=False)
+    ui.step_done("building in background")
+
+    def wait_for_database() -> None:
+        """Join the background database build and report its outcome once."""
+        nonlocal database_path, db_future
+        if db_future is None:
+            return
+        future, db_future = db_future, None
+        try:
+            with ui.spinner("Finishing search database"):
+                future.result()
+        except Exception as e:
+            ui.substep(f"Database build failed: {e}")
+            _logger.exception("Database build failed")
+            database_path = None
 
     # =========================================================================
     # Step 7: Verify files and recover any missing
@@ -450,74 +872,77 @@ def run_full_export(
         ui.step_done("skipped (light mode)")
     else:
         try:
-            from .backfill import load_missing_from_index, run_backfill
-            from .retry import (
-                merge_recovered_into_metadata,
-                retry_missing_attachments,
-                retry_missing_content_versions,
-            )
-            from .verify import verify_attachments, verify_content_versions
-
             att_meta = links_dir / "attachments.csv"
             cv_meta = links_dir / "content_versions.csv"
             master_index = meta_dir / "master_documents_index.csv"
             recovered_any = False
 
-            # Scan for missing files
-            missing_in_index = []
-            missing_attachments = []
-            missing_content_versions = []
+            # Scan for missing files. Verify still writes the *_missing.csv
+            # reports, but the retry pass uses the returned rows directly.
+            missing_in_index = 0
+            missing_att_rows: list[dict] = []
+            missing_cv_rows: list[dict] = []
 
             with ui.spinner("Verifying downloaded files"):
                 if master_index.exists():
-                    missing_in_index = load_missing_from_index(master_index)
+                    missing_in_index = count_missing_in_index(master_index)
 
                 if att_meta.exists():
-                    verify_attachments(str(att_meta), str(export_path))
-                    missing_csv = links_dir / "attachments_missing.csv"
-                    if missing_csv.exists():
-                        missing_attachments = _load_csv_rows(missing_csv)
+                    missing_att_rows = verify_attachments_rows(str(att_meta), str(export_path))
 
                 if cv_meta.exists():
-                    verify_content_versions(str(cv_meta), str(export_path))
-                    missing_csv = links_dir / "content_versions_missing.csv"
-                    if missing_csv.exists():
-                        missing_content_versions = _load_csv_rows(missing_csv)
+                    missing_cv_rows = verify_content_versions_rows(str(cv_meta), str(export_path))
 
-            total_missing = len(missing_in_index)
-            metadata_missing = len(missing_attachments) + len(missing_content_versions)
+            missing_attachments = len(missing_att_rows)
+            missing_content_versions = len(missing_cv_rows)
+            total_missing = missing_in_index
+            metadata_missing = missing_attachments + missing_content_versions
 
             if total_missing == 0 and metadata_missing == 0:
                 ui.substep("all files verified")
             else:
                 files_to_recover = max(total_missing, metadata_missing)
                 ui.substep(f"{files_to_recover:,} files to download")
+                # Recovery rewrites the build's input CSVs (os.replace fails on
+                # Windows while they are open), so the build must finish first
+                wait_for_database()
+                ui.flush()  # Retry/backfill progress goes to stderr via tqdm
 
                 recovered_count = 0
 
-                # First-pass: retry from metadata CSVs
+                # First-pass: retry the rows verify reported missing
                 if missing_attachments:
-                    retry_missing_attachments(
-                        api, missing_attachments, str(export_path), str(links_dir)
+                    still_missing = retry_missing_attachments(
+                        api, missing_att_rows, str(export_path), str(links_dir)
                     )
-                    retry_csv = links_dir / "attachments_missing_retry.csv"
-                    if retry_csv.exists():
+                    if still_missing < missing_attachments:
+                        retry_csv = links_dir / "attachments_missing_retry.csv"
                         count = merge_recovered_into_metadata(str(att_meta), str(retry_csv))
                         if count > 0:
                             recovered_any = True
                             recovered_count += count
 
                 if missing_content_versions:
-                    retry_missing_content_versions(
-                        api, missing_content_versions, str(export_path), str(links_dir)
+                    still_missing = retry_missing_content_versions(
+                        api, missing_cv_rows, str(export_path), str(links_dir)
                     )
-                    retry_csv = links_dir / "content_versions_missing_retry.csv"
-                    if retry_csv.exists():
+                    if still_missing < missing_content_versions:
+                        retry_csv = links_dir / "content_versions_missing_retry.csv"
                         count = merge_recovered_into_metadata(str(cv_meta), str(retry_csv))
                         if count > 0:
                             recovered_any = True
                             recovered_count += count
 
+                # Carry retry recoveries into the master index before backfill
+                # reads it; patch in place unless most of the index changed.
+                # index_rows is 0 if Step 4 failed, so a stale index is rebuilt.
+                recovered_paths = _recovered_index_paths(missing_att_rows, missing_cv_rows)
+                if recovered_paths and master_index.exists():
+                    if len(recovered_paths) > _MASTER_INDEX_PATCH_LIMIT * index_rows:
+                        _build_master_index(export_path)
+                    else:
+                        _patch_master_index(master_index, recovered_paths)
+
                 # Second-pass: backfill from master index
                 if missing_in_index:
                     backfill_result = run_backfill(
@@ -535,18 +960,11 @@ def run_full_export(
                 if recovered_any:
                     with ui.spinner("Finalizing database"):
                         database_path = meta_dir / "sfdata.db"
-                        build_sqlite_from_export(
-                            str(export_path), str(database_path), overwrite=True
-                        )
+                        _build_database(build_sqlite_from_export, export_path, database_path)
 
                     # Count actual missing from updated master index
-                    if master_index.exists():
-                        updated_rows = _load_csv_rows(master_index)
-                        files_missing = sum(
-                            1 for r in updated_rows if not (r.get("local_path") or "").strip()
-                        )
-                    else:
-                        files_missing = 0
+                    index_counts = _index_path_counts(master_index)
+                    files_missing = index_counts[1]
                 else:
                     files_missing = total_missing
 
@@ -571,22 +989,15 @@ def run_full_export(
             ui.step_error(str(e))
             _logger.exception("Verification failed")
 
+    wait_for_database()
+
     # =========================================================================
     # Summary
     # =========================================================================
-    master_index = meta_dir / "master_documents_index.csv"
-    total_expected = 0
-    total_downloaded = 0
-    total_missing = 0
-
-    if master_index.exists():
-        index_rows = _load_csv_rows(master_index)
-        for row in index_rows:
-            total_expected += 1
-            if (row.get("local_path") or "").strip():
-                total_downloaded += 1
-            else:
-                total_missing += 1
+    if index_counts is None:
+        index_counts = _index_path_counts(meta_dir / "master_documents_index.csv")
+    total_downloaded, total_missing = index_counts
+    total_expected = total_downloaded + total_missing
 
     ui.summary_header("Export Summary")
     ui.summary_item("Location:", str(export_path))
@@ -614,8 +1025,9 @@ def run_full_export(
         ui.summary_item("Files:", str(files_exported))
 
     # List the CSV files that were exported
-    csv_files = sorted(csv_dir.glob("*.csv")) if csv_dir.exists() else []
-    csv_names = [f.stem for f in csv_files]
+    # csv_dir was created up front, so no existence check is needed
+    with os.scandir(csv_dir) as it:
+        csv_names = sorted(e.name[:-4] for e in it if e.name.endswith(".csv"))
 
     if csv_names:
         # Show count with examples
@@ -634,6 +1046,7 @@ def run_full_export(
     ui.info("To browse your data:")
     ui.info("  sf view")
     ui.blank()
+    ui.flush()
 
     # Generate inventory manifest (never breaks a successful export)
     try:
@@ -645,6 +1058,8 @@ def run_full_export(
     except Exception:
         _logger.warning("Inventory generation failed", exc_info=True)
 
+    invalidate_export_cache()
+
     return ExportResult(
         success=True,
         export_path=export_path,
@@ -656,18 +1071,36 @@ def run_full_export(
     )
 
 
-def find_latest_export(base_path: Path = Path("./exports")) -> Path | None:
-    """Find the most recent export directory."""
-    if not base_path.exists():
+@functools.lru_cache(maxsize=4)
+def _latest_export_name(base_path: Path, _bucket: int) -> str | None:
+    """Return the newest export-* directory name under base_path (cached per TTL bucket)."""
+    # scandir reuses the dirent type, so is_dir() needs no extra stat per entry
+    # (symlinked exports are still followed, as with Path.is_dir()).
+    # export-YYYY-MM-DD names sort chronologically, so max() is the newest.
+    try:
+        with os.scandir(base_path) as it:
+            return max(
+                (e.name for e in it if e.name.startswith("export-") and e.is_dir()),
+                default=None,
+            )
+    except (FileNotFoundError, NotADirectoryError):
         return None
 
-    exports = sorted(
-        [d for d in base_path.iterdir() if d.is_dir() and d.name.startswith("export-")],
-        key=lambda d: d.name,
-        reverse=True,
-    )
 
-    return exports[0] if exports else None
+def find_latest_export(base_path: Path = Path("./exports")) -> Path | None:
+    """Find the most recent export directory.
+
+    The directory scan is memoized for ``_EXPORT_CACHE_TTL`` seconds; call
+    :func:`invalidate_export_cache` after creating a new export.
+    """
+    name = _latest_export_name(Path(base_path).absolute(), int(time.time()) // _EXPORT_CACHE_TTL)
+    return Path(base_path) / name if name else None
+
+
+def invalidate_export_cache() -> None:
+    """Forget memoized export lookups so new exports are seen immediately."""
+    _latest_export_name.cache_clear()
+    _default_export_path_for.cache_clear()
 
 
 def ensure_database(export_path: Path) -> Path:
@@ -680,8 +1113,9 @@ def ensure_database(export_path: Path) -> Path:
         return db_path
 
     print(f"Building database for {export_path}...")
-    (export_path / "meta").mkdir(parents=True, exist_ok=True)
-    build_sqlite_from_export(str(export_path), str(db_path))
+    # build_sqlite_from_export creates meta/ itself if needed
+    with _sqlite_build_env():
+        build_sqlite_from_export(str(export_path), str(db_path))
     print(f"Database ready: {db_path}")
 
     return db_path
@@ -702,9 +1136,10 @@ def launch_viewer(export_path: Path | None = None) -> None:
             print("No export found. Run 'sf dump' first.")
             sys.exit(1)
 
-    export_path = Path(export_path).resolve()
+    # abspath is pure string work; resolve() would lstat every path component
+    export_path = Path(os.path.abspath(export_path))
 
-    if not export_path.exists():
+    if not export_path.is_dir():
         print(f"Export directory not found: {export_path}")
         sys.exit(1)
 
@@ -11,9 +11,13 @@ def build_probe_summary(report: Dict[str, Any]) -> Dict[str, Any]:
 
     def num(key: str) -> int:
         v = counts.get(key)
+        if isinstance(v, int):
+            return v
+        if v is None:
+            return 0
         try:
             return int(v)
-        except Exception:
+        except (TypeError, ValueError, OverflowError):
             return 0
 
     def status(ok: bool, warn: bool = False) -> str:
@@ -98,39 +102,50 @@ def build_probe_summary(report: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write pretty-printed JSON, using orjson when it is installed."""
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        except TypeError:
+            pass  # e.g. non-str keys or out-of-range ints: let json handle it
+
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
 def write_probe_summary(meta_dir: Path, report: Dict[str, Any]) -> Dict[str, Any]:
     summary = build_probe_summary(report)
 
     json_out = meta_dir / "probe_summary.json"
     md_out = meta_dir / "probe_summary.md"
 
-    json_out.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
-
-    lines: List[str] = []
-    lines.append(f"# Probe Summary: {summary['overall']}")
-    lines.append("")
-    lines.append(f"- Generated (UTC): `{summary.get('generated_utc')}`")
-    lines.append("")
-    lines.append("## Checks")
-    lines.append("")
-    lines.append("| Check | Status | Detail |")
-    lines.append("|---|---|---|")
-    for c in summary.get("checks", []):
-        lines.append(f"| {c['name']} | **{c['status']}** | {c['detail']} |")
-    lines.append("")
+    _write_json(json_out, summary)
+
+    # One string per section, each built in a single expression
+    sections: List[str] = [
+        f"# Probe Summary: {summary['overall']}\n\n"
+        f"- Generated (UTC): `{summary.get('generated_utc')}`\n\n"
+        "## Checks\n\n"
+        "| Check | Status | Detail |\n"
+        "|---|---|---|\n"
+        + "".join(
+            f"| {c['name']} | **{c['status']}** | {c['detail']} |\n"
+            for c in summary.get("checks", [])
+        )
+    ]
     if summary.get("benign_notes"):
-        lines.append("## Benign warnings")
-        lines.append("")
-        for b in summary["benign_notes"]:
-            lines.append(f"- {b}")
-        lines.append("")
+        sections.append(
+            "## Benign warnings\n\n" + "".join(f"- {b}\n" for b in summary["benign_notes"])
+        )
     if summary.get("errors"):
-        lines.append("## Errors (raw)")
-        lines.append("")
-        lines.append("```json")
-        lines.append(json.dumps(summary["errors"], indent=2, ensure_ascii=False))
-        lines.append("```")
-        lines.append("")
-
-    md_out.write_text("\n".join(lines), encoding="utf-8")
+        errors_json = json.dumps(summary["errors"], indent=2, ensure_ascii=False)
+        sections.append(f"## Errors (raw)\n\n```json\n{errors_json}\n```\n")
+
+    md_out.write_text("\n".join(sections), encoding="utf-8")
     return summary
@@ -27,25 +27,37 @@ from __future__ import annotations
 import logging
 import sys
 import threading
+import time
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterator, TextIO
 
 _logger = logging.getLogger(__name__)
 
 
+# Encodings (as reported by stream.encoding) that can represent every glyph we draw
+_UTF_CODECS = frozenset(
+    {
+        "utf-8",
+        "utf8",
+        "utf-8-sig",
+        "cp65001",  # Windows alias for UTF-8
+        "utf-16",
+        "utf-16-le",
+        "utf-16-be",
+        "utf-32",
+        "utf-32-le",
+        "utf-32-be",
+    }
+)
+
+
 def _supports_unicode() -> bool:
     """Check if the terminal supports Unicode output."""
-    # Check if stdout encoding supports Unicode
-    try:
-        encoding = getattr(sys.stdout, "encoding", None) or ""
-        if encoding.lower() in ("utf-8", "utf8", "utf-16", "utf-32"):
-            return True
-        # Try to encode a Unicode character
-        "✓".encode(encoding)
-        return True
-    except (UnicodeEncodeError, LookupError):
-        return False
+    encoding = getattr(sys.stdout, "encoding", None) or ""
+    return encoding.lower().replace("_", "-") in _UTF_CODECS
 
 
 # Detect Unicode support once at module load
@@ -65,20 +77,114 @@ else:
     BAR_EMPTY = "-"
 
 
-class ProgressBar:
+def _is_interactive(stream: TextIO) -> bool:
+    """Return True if stream is a terminal (spinner animation only helps there)."""
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _bar_table(width: int) -> tuple[str, ...]:
+    """Every bar of the given width, indexed by filled cell count (shared by all bars)."""
+    return tuple(BAR_FILLED * i + BAR_EMPTY * (width - i) for i in range(width + 1))
+
+
+# Pre-rendered bars for the default width
+_BAR_WIDTH = 20
+_BAR_CACHE = _bar_table(_BAR_WIDTH)
+
+
+def _frame_interval(idle: float) -> float:
+    """Seconds until the next frame: 10 fps while busy, slowing once nothing changes."""
+    if idle < 2:
+        return 0.1
+    if idle < 10:
+        return 0.3
+    return 1.0
+
+
+class _Ticker:
     """
-    A progress bar with animated spinner that runs in a background thread.
+    A single background thread that redraws every active ProgressBar/Spinner.
+
+    Widgets register on enter and unregister on exit, so a long export that
+    opens dozens of bars reuses one thread instead of starting and joining one
+    per bar. The thread idles on an event while nothing is registered.
+    """
+
+    INTERVAL = 0.1  # Redraw every 100ms
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        # Held for a whole round of redraws so unregister() can wait one out
+        self._tick_lock = threading.Lock()
+        self._registered: list[weakref.ReferenceType] = []
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, widget: ProgressBar | Spinner) -> None:
+        """Start redrawing widget on every tick."""
+        with self._lock:
+            self._registered.append(weakref.ref(widget))
+            self._wake.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sfdump-progress", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, widget: ProgressBar | Spinner) -> None:
+        """Stop redrawing widget; returns once no frame of it is mid-write."""
+        with self._lock:
+            self._registered = [
+                ref for ref in self._registered if ref() is not None and ref() is not widget
+            ]
+            if not self._registered:
+                self._wake.clear()
+        with self._tick_lock:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            with self._tick_lock:
+                # Copy under the lock, draw outside it
+                with self._lock:
+                    widgets = [w for ref in self._registered if (w := ref()) is not None]
+                for widget in widgets:
+                    try:
+                        widget._tick()
+                    except Exception:  # pragma: no cover - never kill the shared thread
+                        _logger.debug("Progress redraw failed", exc_info=True)
+            time.sleep(self.INTERVAL)
+
+
+_ticker = _Ticker()
+
 
-    The spinner animates continuously (every 100ms) while the progress bar
-    shows completion percentage. This provides visual feedback even when
-    individual work items take several seconds.
+class ProgressBar:
+    """
+    A progress bar with an animated spinner, redrawn by a shared background thread.
+
+    The spinner animates continuously (every 100ms, slowing to once a second
+    after a long stretch without progress) while the progress bar shows
+    completion percentage. This provides visual feedback even when
+    individual work items take several seconds. Frames identical to the last
+    one written are skipped; on non-terminal output the spinner holds still,
+    so the bar is only rewritten when progress changes.
+
+    update() takes no lock: it assumes a single producer thread, and the
+    ticker only needs a consistent snapshot of the (atomically assigned)
+    progress value per frame.
     """
 
     def __init__(
         self,
         label: str = "",
         total: int = 100,
-        width: int = 20,
+        width: int = _BAR_WIDTH,
         indent: str = "      ",
         output: TextIO = sys.stdout,
     ):
@@ -88,60 +194,78 @@ class ProgressBar:
         self.indent = indent
         self.output = output
         self._current = 0
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
-        self._lock = threading.Lock()
+        self._dirty = True
+        self._last_line: str | None = None
+        self._write = output.write
+        self._flush = output.flush
+        self._animated = _is_interactive(output)
+        self._idx = 0
+        self._last_change = time.monotonic()
+        self._next_frame = 0.0
+        # Everything but the spinner glyph and progress is fixed per bar
+        self._prefix = f"{indent}{label} " if label else indent
+        self._bars = _bar_table(width)
 
     def _render_bar(self, spinner_idx: int) -> str:
         """Render the progress bar with current spinner character."""
         spinner_char = SPINNER_CHARS[spinner_idx % len(SPINNER_CHARS)]
+        current = self._current
         if self.total == 0:
             pct = 0
             filled = 0
         else:
-            pct = (self._current * 100) // self.total
-            filled = (self._current * self.width) // self.total
-        bar = BAR_FILLED * filled + BAR_EMPTY * (self.width - filled)
-        label_part = f"{self.label} " if self.label else ""
-        return f"{self.indent}{label_part}{spinner_char} [{bar}] {pct:3d}%"
-
-    def _animate(self) -> None:
-        """Background thread that animates the spinner."""
-        idx = 0
-        while not self._stop_event.is_set():
-            with self._lock:
-                line = self._render_bar(idx)
-            print(f"\r{line}", end="", flush=True, file=self.output)
-            idx += 1
-            self._stop_event.wait(0.1)  # Update every 100ms
+            pct = (current * 100) // self.total
+            filled = min((current * self.width) // self.total, self.width)
+        return f"{self._prefix}{spinner_char} [{self._bars[filled]}] {pct:3d}%"
+
+    def _tick(self) -> None:
+        """Draw one animation frame (called by the shared ticker)."""
+        now = time.monotonic()
+        if not self._dirty and now < self._next_frame:
+            return
+        self._next_frame = now + _frame_interval(now - self._last_change)
+        if self._animated or self._dirty:
+            # Clear before rendering so an update() racing with us is drawn next tick
+            self._dirty = False
+            line = "\r" + self._render_bar(self._idx)
+        else:
+            line = self._last_line
+        if line != self._last_line:
+            self._write(line)
+            self._flush()
+            self._last_line = line
+        if self._animated:
+            self._idx += 1
 
     def update(self, current: int) -> None:
-        """Update the progress value (thread-safe)."""
-        with self._lock:
+        """Update the progress value (from a single producer thread)."""
+        if current != self._current:
             self._current = current
+            self._last_change = time.monotonic()
+            self._dirty = True
 
     def __enter__(self) -> "ProgressBar":
-        self._thread = threading.Thread(target=self._animate, daemon=True)
-        self._thread.start()
+        self._tick()
+        _ticker.register(self)
         return self
 
     def __exit__(self, *args) -> None:
-        self._stop_event.set()
-        if self._thread:
-            self._thread.join(timeout=0.5)
+        _ticker.unregister(self)
         # Print final state and newline
-        with self._lock:
-            line = self._render_bar(0)
+        line = self._render_bar(0)
         # Replace spinner with checkmark for final output
         line = line.replace(SPINNER_CHARS[0], CHECKMARK)
-        print(f"\r{line}", flush=True, file=self.output)
+        self._write(f"\r{line}\n")
+        self._flush()
 
 
 class Spinner:
     """
     An animated spinner for operations without known progress.
 
-    Shows activity with a spinning character and optional message.
+    Shows activity with a spinning character and optional message. The spin
+    slows down the longer it runs (see _frame_interval). Off a terminal the
+    glyph holds still, so only the first frame is written.
     """
 
     def __init__(
@@ -153,37 +277,47 @@ class Spinner:
         self.message = message
         self.indent = indent
         self.output = output
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
-
-    def _animate(self) -> None:
-        """Background thread that animates the spinner."""
-        idx = 0
-        while not self._stop_event.is_set():
-            char = SPINNER_CHARS[idx % len(SPINNER_CHARS)]
-            msg_part = f" {self.message}" if self.message else ""
-            print(f"\r{self.indent}{char}{msg_part}", end="", flush=True, file=self.output)
-            idx += 1
-            self._stop_event.wait(0.1)
+        self._msg_part = f" {message}" if message else ""
+        self._animated = _is_interactive(output)
+        self._idx = 0
+        self._last_line: str | None = None
+        self._started = time.monotonic()
+        self._next_frame = 0.0
+
+    def _tick(self) -> None:
+        """Draw one animation frame (called by the shared ticker)."""
+        now = time.monotonic()
+        if now < self._next_frame:
+            return
+        self._next_frame = now + _frame_interval(now - self._started)
+        char = SPINNER_CHARS[self._idx % len(SPINNER_CHARS)]
+        line = f"\r{self.indent}{char}{self._msg_part}"
+        if line != self._last_line:
+            self.output.write(line)
+            self.output.flush()
+            self._last_line = line
+        if self._animated:
+            self._idx += 1
 
     def __enter__(self) -> "Spinner":
-        # Print newline to ensure spinner is on its own line
-        print(file=self.output)
-        self._thread = threading.Thread(target=self._animate, daemon=True)
-        self._thread.start()
+        # Newline to put the spinner on its own line; left buffered so it goes
+        # out with the first frame's flush
+        self.output.write("\n")
+        self._started = time.monotonic()
+        self._tick()
+        _ticker.register(self)
         return self
 
     def __exit__(self, *args) -> None:
-        self._stop_event.set()
-        if self._thread:
-            self._thread.join(timeout=0.5)
+        _ticker.unregister(self)
         # Show completion with checkmark (same pattern as ProgressBar)
         msg_part = f" {self.message}" if self.message else ""
         # Clear line and print final state with checkmark
-        print(f"\r{self.indent}{CHECKMARK}{msg_part}", flush=True, file=self.output)
+        self.output.write(f"\r{self.indent}{CHECKMARK}{msg_part}\n")
+        self.output.flush()
 
 
-@dataclass
+@dataclass(slots=True)
 class StepContext:
     """Context for a step, used to track completion."""
 
@@ -196,7 +330,7 @@ class StepContext:
     def done(self, message: str = "done") -> None:
         """Mark step as done with optional message."""
         if not self._completed:
-            self.reporter._print(f" {message}")
+            self.reporter._print(f" {message}", flush=True)
             self._completed = True
 
     def error(self, message: str) -> None:
@@ -235,11 +369,37 @@ class ProgressReporter:
         self.verbose = verbose
         self._current_step = 0
         self._total_steps = 0
+        # Partial lines ("[1/6] Step...") are only worth flushing to a terminal
+        self._is_tty = _is_interactive(output)
 
-    def _print(self, msg: str = "", end: str = "\n", file: TextIO | None = None) -> None:
-        """Print to output stream."""
+    def _print(
+        self,
+        msg: str = "",
+        end: str = "\n",
+        file: TextIO | None = None,
+        flush: bool = False,
+    ) -> None:
+        """
+        Print to output stream.
+
+        Ordinary lines are left in the stream's buffer; only step boundaries,
+        errors and the start of long-running indicators flush, so a full export
+        issues a handful of writes instead of one per line. When output is not a
+        terminal (CI logs, redirected files), flushes are also skipped for
+        lines left open with end="", since a log reader only sees whole lines.
+        """
         target = file or self.output
-        print(msg, end=end, flush=True, file=target)
+        if target is not self.output:
+            # Keep ordering when switching streams (e.g. errors to stderr)
+            self.output.flush()
+            flush = True
+        elif flush and not self._is_tty and not end:
+            flush = False
+        print(msg, end=end, flush=flush, file=target)
+
+    def flush(self) -> None:
+        """Flush any buffered output (call after the final summary line)."""
+        self.output.flush()
 
     # -------------------------------------------------------------------------
     # Headers and separators
@@ -249,7 +409,7 @@ class ProgressReporter:
         """Print a header (e.g., 'SF Data Export')."""
         self._print()
         self._print(text)
-        self._print(self.SEPARATOR_CHAR * self.SEPARATOR_WIDTH)
+        self._print(self.SEPARATOR_CHAR * self.SEPARATOR_WIDTH, flush=True)
 
     def separator(self) -> None:
         """Print a separator line."""
@@ -287,7 +447,7 @@ class ProgressReporter:
         if num > 1:
             self._print()
 
-        self._print(f"[{num}/{total}] {message}...", end="")
+        self._print(f"[{num}/{total}] {message}...", end="", flush=True)
 
         ctx = StepContext(num=num, total=total, message=message, reporter=self)
         try:
@@ -309,11 +469,11 @@ class ProgressReporter:
         if num > 1:
             self._print()
 
-        self._print(f"[{num}/{total}] {message}...", end="")
+        self._print(f"[{num}/{total}] {message}...", end="", flush=True)
 
     def step_done(self, message: str = "done") -> None:
         """Complete a step started with step_start()."""
-        self._print(f" {message}")
+        self._print(f" {message}", flush=True)
 
     def step_error(self, message: str) -> None:
         """Mark a step as failed."""
@@ -330,7 +490,7 @@ class ProgressReporter:
     def substep_header(self, message: str) -> None:
         """Print a substep header (e.g., 'Attachments (legacy):')."""
         self._print()  # Blank line before substep header
-        self._print(f"{self.INDENT}{message}")
+        self._print(f"{self.INDENT}{message}", flush=True)
 
     def detail(self, message: str) -> None:
         """Print a detail message (double indented)."""
@@ -359,6 +519,7 @@ class ProgressReporter:
                     process(item)
                     pb.update(i + 1)
         """
+        self.flush()
         return ProgressBar(
             label=label,
             total=total,
@@ -374,6 +535,7 @@ class ProgressReporter:
             with reporter.spinner("Building indexes"):
                 build_indexes()
         """
+        self.flush()
         return Spinner(
             message=message,
             indent=indent or self.INDENT,
@@ -5,10 +5,14 @@ Report generation for missing-file analysis in Markdown (and optional PDF).
 import csv
 import logging
 import os
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
 
 _logger = logging.getLogger(__name__)
 
+# Image types picked up as the default report logo
+_LOGO_EXTS = (".png", ".jpg", ".jpeg", ".svg")
+
 # -------------------------
 # Markdown template builder
 # -------------------------
@@ -22,12 +26,27 @@ def _markdown_section(title: str) -> str:
     return f"\n## {title}\n\n"
 
 
-def _markdown_table(headers, rows):
-    out = "| " + " | ".join(headers) + " |\n"
-    out += "| " + " | ".join(["---"] * len(headers)) + " |\n"
+def _iter_markdown_table(headers, rows):
+    """Yield the lines of a Markdown table, for streaming to a file."""
+    yield "| " + " | ".join(headers) + " |\n"
+    yield "| " + " | ".join(["---"] * len(headers)) + " |\n"
+    # One %-template per table: each row is a single format, no join per row
+    row_fmt = "| " + " | ".join(["%s"] * len(headers)) + " |\n"
     for row in rows:
-        out += "| " + " | ".join(row) + " |\n"
-    return out + "\n"
+        yield row_fmt % tuple(row)
+    yield "\n"
+
+
+def _markdown_table(headers, rows):
+    return "".join(_iter_markdown_table(headers, rows))
+
+
+def _safe_int(value) -> int:
+    """Parse a CSV count cell, treating blanks and junk as 0."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
 
 
 def _load_csv(path: str):
@@ -37,26 +56,26 @@ def _load_csv(path: str):
         return list(csv.DictReader(f))
 
 
-def _make_redaction_maps(retry_rows, analysis):
-    """Build stable pseudonym maps for attachments and parents."""
-    att_map: dict[str, str] = {}
-    parent_map: dict[str, str] = {}
+def _count_csv(path: str) -> int:
+    """Count the data rows of a CSV without loading it (blank lines skipped, as DictReader)."""
+    if not os.path.isfile(path):
+        return 0
+    with open(path, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        if next(reader, None) is None:
+            return 0
+        return sum(1 for row in reader if row)
 
-    # Attachments: ATTACHMENT_1, ATTACHMENT_2, ...
-    for idx, r in enumerate(retry_rows, start=1):
-        real_id = r.get("Id") or f"ATT-{idx}"
-        if real_id not in att_map:
-            att_map[real_id] = f"ATTACHMENT_{idx}"
 
-    # Parents: PARENT_1, PARENT_2, ...
-    i = 1
-    for r in analysis:
-        pid = r.get("ParentId") or ""
-        if pid and pid not in parent_map:
-            parent_map[pid] = f"PARENT_{i}"
-            i += 1
+def _add_attachment_pseudonym(att_map: dict[str, str], idx: int, att_id) -> None:
+    """Number an attachment ATTACHMENT_<idx> by the first retry row it appears in."""
+    att_map.setdefault(att_id or f"ATT-{idx}", f"ATTACHMENT_{idx}")
 
-    return att_map, parent_map
+
+def _parent_redaction_map(analysis) -> dict[str, str]:
+    """Map parents to PARENT_1, PARENT_2, ... (numbered by distinct parent, in order)."""
+    parent_ids = dict.fromkeys(pid for r in analysis if (pid := r.get("ParentId")))
+    return {pid: f"PARENT_{i}" for i, pid in enumerate(parent_ids, start=1)}
 
 
 # -------------------------
@@ -78,21 +97,32 @@ def generate_missing_report(
 
     links = os.path.join(export_dir, "links")
 
-    # Core CSVs
-    attachments_meta = _load_csv(os.path.join(links, "attachments.csv"))
-    content_meta = _load_csv(os.path.join(links, "content_versions.csv"))
-    attach_missing = _load_csv(os.path.join(links, "attachments_missing.csv"))
-    cv_missing = _load_csv(os.path.join(links, "content_versions_missing.csv"))
+    # Core CSVs. The metadata and missing lists are only counted, so stream
+    # them; only the retry and analysis rows rendered into tables are loaded.
+    total_attachments = _count_csv(os.path.join(links, "attachments.csv"))
+    total_cv = _count_csv(os.path.join(links, "content_versions.csv"))
+    missing_attachments = _count_csv(os.path.join(links, "attachments_missing.csv"))
+    missing_cv = _count_csv(os.path.join(links, "content_versions_missing.csv"))
     retry_rows = _load_csv(os.path.join(links, "attachments_missing_retry.csv"))
     analysis = _load_csv(os.path.join(links, "missing_file_analysis.csv"))
 
-    total_attachments = len(attachments_meta)
-    total_cv = len(content_meta)
-    missing_attachments = len(attach_missing)
-    missing_cv = len(cv_missing)
-
-    recovered = sum(1 for r in retry_rows if r.get("retry_success") == "true")
-    permanent = sum(1 for r in retry_rows if r.get("retry_success") == "false")
+    # One pass over the retry rows for both outcome counts, the affected Ids
+    # (deduplicated in first-seen order; a retry log can hold several attempts per
+    # Id) and, when redacting, the attachment pseudonyms
+    recovered = permanent = 0
+    retry_ids: dict[str, None] = {}
+    att_map: dict[str, str] = {}
+    for idx, r in enumerate(retry_rows, start=1):
+        outcome = r.get("retry_success")
+        if outcome == "true":
+            recovered += 1
+        elif outcome == "false":
+            permanent += 1
+        att_id = r.get("Id")
+        if att_id:
+            retry_ids[att_id] = None
+        if redact:
+            _add_attachment_pseudonym(att_map, idx, att_id)
 
     exported_attachments = total_attachments - missing_attachments if total_attachments else 0
     exported_cv = total_cv - missing_cv if total_cv else 0
@@ -103,7 +133,10 @@ def generate_missing_report(
         return f"{(part / whole) * 100:.2f}%"
 
     # Determine base path for outputs
-    ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    # One clock read for the file name and both timestamps in the report
+    now = datetime.now(timezone.utc)
+    ts = now.strftime("%Y%m%d-%H%M%S")
+    generated_at = now.replace(tzinfo=None).isoformat()  # labelled UTC in the text
     if out_basename:
         base_path = out_basename
         # If it's just a name (no directory), write under links/
@@ -123,11 +156,15 @@ def generate_missing_report(
     if not logo_path:
         default_logo_dir = os.path.join(os.getcwd(), "src", "logos")
         if os.path.isdir(default_logo_dir):
-            for fname in sorted(os.listdir(default_logo_dir)):
-                if fname.lower().endswith((".png", ".jpg", ".jpeg", ".svg")):
-                    logo_path = os.path.join(default_logo_dir, fname)
-                    _logger.info("Using default logo at %s", logo_path)
-                    break
+            # First image by name, without sorting the whole listing
+            with os.scandir(default_logo_dir) as entries:
+                fname = min(
+                    (e.name for e in entries if e.name.lower().endswith(_LOGO_EXTS)),
+                    default=None,
+                )
+            if fname:
+                logo_path = os.path.join(default_logo_dir, fname)
+                _logger.info("Using default logo at %s", logo_path)
 
     # Try to infer Salesforce instance URL from analysis ParentRecordUrl
     instance_url = "unknown"
@@ -144,175 +181,175 @@ def generate_missing_report(
     except Exception:
         sfdump_version = "unknown"
 
-    # Redaction maps
-    att_map, parent_map = _make_redaction_maps(retry_rows, analysis) if redact else ({}, {})
+    # Parent redaction map (attachment pseudonyms were assigned above)
+    parent_map = _parent_redaction_map(analysis) if redact else {}
 
     # -----------
-    # Build Markdown
+    # Write Markdown (streamed straight to the file, section by section)
     # -----------
 
-    md = ""
-
-    # Optional logo (use relative path from md file location if we have a logo)
-    if logo_path:
-        rel_logo = os.path.relpath(logo_path, os.path.dirname(md_path))
-        md += f"![Logo]({rel_logo})\n\n"
-
-    md += _markdown_header("Salesforce File Export Integrity Report")
-    md += f"Report generated: **{datetime.utcnow().isoformat()} UTC**\n\n"
-
-    # Executive Summary
-    md += _markdown_section("Executive Summary")
-    md += "- **Attachments**\n"
-    md += f"  - Total discovered: **{total_attachments}**\n"
-    md += f"  - Successfully exported: **{exported_attachments}** ({_pct(exported_attachments, total_attachments)})\n"
-    md += f"  - Missing or unrecoverable: **{missing_attachments}** ({_pct(missing_attachments, total_attachments)})\n\n"
-
-    md += "- **Content Versions**\n"
-    md += f"  - Total discovered: **{total_cv}**\n"
-    md += f"  - Successfully exported: **{exported_cv}** ({_pct(exported_cv, total_cv)})\n"
-    md += f"  - Missing or unrecoverable: **{missing_cv}** ({_pct(missing_cv, total_cv)})\n\n"
-
-    md += f"- Files recovered on retry: **{recovered}**\n"
-    md += f"- Files still failing after retry: **{permanent}**\n\n"
-
-    md += (
-        "**Conclusion:** The vast majority of files were exported successfully. "
-        "The remaining missing files are cases where Salesforce returns a zero-byte body "
-        "despite valid metadata, which indicates that the binary content no longer exists "
-        "inside Salesforce and cannot be recovered via API or permissions changes.\n\n"
-    )
-
-    # -----------------------------
-    # Diagnostic Evidence (with redaction)
-    # -----------------------------
-    md += _markdown_section("Diagnostic Evidence")
-    if retry_rows:
-        table_rows = []
-        for r in retry_rows:
-            att_id = r.get("Id", "")
-            parent_id = r.get("ParentId", "")
-            name = r.get("Name", "")
+    with open(md_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        w = f.write
 
-            if redact:
-                att_label = att_map.get(att_id, "ATTACHMENT")
-                parent_label = parent_map.get(parent_id, "PARENT")
-                display_att = att_label
-                display_parent = parent_label
-                display_name = "[REDACTED]"
-            else:
-                display_att = att_id
-                display_parent = parent_id
-                display_name = name
-
-            table_rows.append(
-                [
-                    display_att,
-                    display_parent,
-                    display_name,
-                    r.get("retry_status", ""),
-                    (r.get("retry_error", "") or "").replace("|", "/"),
-                ]
-            )
-        md += _markdown_table(
-            ["Attachment", "Parent", "Name", "Retry Status", "Error"],
-            table_rows,
+        # Optional logo (use relative path from md file location if we have a logo)
+        if logo_path:
+            rel_logo = os.path.relpath(logo_path, os.path.dirname(md_path))
+            w(f"![Logo]({rel_logo})\n\n")
+
+        w(_markdown_header("Salesforce File Export Integrity Report"))
+        w(f"Report generated: **{generated_at} UTC**\n\n")
+
+        # Executive Summary
+        w(_markdown_section("Executive Summary"))
+        w("- **Attachments**\n")
+        w(f"  - Total discovered: **{total_attachments}**\n")
+        w(
+            f"  - Successfully exported: **{exported_attachments}** ({_pct(exported_attachments, total_attachments)})\n"
+        )
+        w(
+            f"  - Missing or unrecoverable: **{missing_attachments}** ({_pct(missing_attachments, total_attachments)})\n\n"
         )
-    else:
-        md += "No retry evidence available (no missing attachments to retry).\n"
-
-    # -----------------------------
-    # Impact on Parent Records (with redaction)
-    # -----------------------------
-    md += _markdown_section("Impact on Parent Records")
-    has_analysis = analysis and not (len(analysis) == 1 and "Message" in analysis[0])
-
-    if has_analysis:
-        # Summary by ParentObject
-        summary_by_obj: dict[str, int] = {}
-        for r in analysis:
-            obj = r.get("ParentObject", "") or "Unknown"
-            try:
-                cnt = int(r.get("MissingCount") or "0")
-            except ValueError:
-                cnt = 0
-            summary_by_obj[obj] = summary_by_obj.get(obj, 0) + cnt
-
-        md += "### Summary by Parent Object Type\n\n"
-        sum_rows = [[obj, str(cnt)] for obj, cnt in sorted(summary_by_obj.items())]
-        md += _markdown_table(["ParentObject", "TotalMissing"], sum_rows)
-
-        md += "### Detailed Impact by Parent Record\n\n"
-        table_rows = []
-        for r in analysis:
-            parent_id = r.get("ParentId", "")
-            parent_name = r.get("ParentName", "")
-            parent_url = r.get("ParentRecordUrl", "")
 
-            if redact:
-                parent_label = parent_map.get(parent_id, "PARENT")
-                display_id = parent_label
-                display_name = "[REDACTED]"
-                display_url = "[REDACTED]"
-            else:
-                display_id = parent_id
-                display_name = parent_name
-                display_url = parent_url
-
-            table_rows.append(
-                [
-                    r.get("ParentObject", ""),
-                    display_id,
-                    display_name,
-                    r.get("MissingCount", ""),
-                    display_url,
-                ]
-            )
-        md += _markdown_table(
-            ["ParentObject", "ParentId", "ParentName", "MissingCount", "Record URL"],
-            table_rows,
+        w("- **Content Versions**\n")
+        w(f"  - Total discovered: **{total_cv}**\n")
+        w(f"  - Successfully exported: **{exported_cv}** ({_pct(exported_cv, total_cv)})\n")
+        w(f"  - Missing or unrecoverable: **{missing_cv}** ({_pct(missing_cv, total_cv)})\n\n")
+
+        w(f"- Files recovered on retry: **{recovered}**\n")
+        w(f"- Files still failing after retry: **{permanent}**\n\n")
+
+        w(
+            "**Conclusion:** The vast majority of files were exported successfully. "
+            "The remaining missing files are cases where Salesforce returns a zero-byte body "
+            "despite valid metadata, which indicates that the binary content no longer exists "
+            "inside Salesforce and cannot be recovered via API or permissions changes.\n\n"
         )
-    else:
-        md += "No impacted parent records (no missing files detected).\n"
-
-    # Recommended message
-    md += _markdown_section("Recommended Message to Salesforce Support")
-    md += (
-        "We have completed a full audit of all Salesforce attachments and content files.\n\n"
-        "Salesforce is returning HTTP 200 (OK) responses for some Attachment Body requests but the "
-        "payload is zero bytes. This indicates that the binary content for these attachments has "
-        "been lost on Salesforce servers while the metadata remains intact.\n\n"
-        "These files cannot be recovered via API, user permissions, or client-side tooling. "
-        "Please advise whether Salesforce can restore these Attachment binaries from platform backups.\n\n"
-        "Affected Attachment Ids:\n\n"
-    )
-    if redact:
-        ids_inline = (
-            ", ".join(att_map.get(r.get("Id", ""), "ATTACHMENT") for r in retry_rows) or "None"
+
+        # -----------------------------
+        # Diagnostic Evidence (with redaction)
+        # -----------------------------
+        w(_markdown_section("Diagnostic Evidence"))
+        if retry_rows:
+
+            def _evidence_rows():
+                for r in retry_rows:
+                    att_id = r.get("Id", "")
+                    parent_id = r.get("ParentId", "")
+                    name = r.get("Name", "")
+
+                    if redact:
+                        att_label = att_map.get(att_id, "ATTACHMENT")
+                        parent_label = parent_map.get(parent_id, "PARENT")
+                        display_att = att_label
+                        display_parent = parent_label
+                        display_name = "[REDACTED]"
+                    else:
+                        display_att = att_id
+                        display_parent = parent_id
+                        display_name = name
+
+                    yield (
+                        display_att,
+                        display_parent,
+                        display_name,
+                        r.get("retry_status", ""),
+                        (r.get("retry_error", "") or "").replace("|", "/"),
+                    )
+
+            f.writelines(
+                _iter_markdown_table(
+                    ["Attachment", "Parent", "Name", "Retry Status", "Error"],
+                    _evidence_rows(),
+                )
+            )
+        else:
+            w("No retry evidence available (no missing attachments to retry).\n")
+
+        # -----------------------------
+        # Impact on Parent Records (with redaction)
+        # -----------------------------
+        w(_markdown_section("Impact on Parent Records"))
+        has_analysis = analysis and not (len(analysis) == 1 and "Message" in analysis[0])
+
+        if has_analysis:
+            # Summary by ParentObject
+            summary_by_obj: Counter[str] = Counter()
+            for r in analysis:
+                summary_by_obj[r.get("ParentObject") or "Unknown"] += _safe_int(
+                    r.get("MissingCount")
+                )
+
+            w("### Summary by Parent Object Type\n\n")
+            sum_rows = [[obj, str(cnt)] for obj, cnt in sorted(summary_by_obj.items())]
+            f.writelines(_iter_markdown_table(["ParentObject", "TotalMissing"], sum_rows))
+
+            w("### Detailed Impact by Parent Record\n\n")
+
+            def _impact_rows():
+                for r in analysis:
+                    parent_id = r.get("ParentId", "")
+                    parent_name = r.get("ParentName", "")
+                    parent_url = r.get("ParentRecordUrl", "")
+
+                    if redact:
+                        parent_label = parent_map.get(parent_id, "PARENT")
+                        display_id = parent_label
+                        display_name = "[REDACTED]"
+                        display_url = "[REDACTED]"
+                    else:
+                        display_id = parent_id
+                        display_name = parent_name
+                        display_url = parent_url
+
+                    yield (
+                        r.get("ParentObject", ""),
+                        display_id,
+                        display_name,
+                        r.get("MissingCount", ""),
+                        display_url,
+                    )
+
+            f.writelines(
+                _iter_markdown_table(
+                    ["ParentObject", "ParentId", "ParentName", "MissingCount", "Record URL"],
+                    _impact_rows(),
+                )
+            )
+        else:
+            w("No impacted parent records (no missing files detected).\n")
+
+        # Recommended message
+        w(_markdown_section("Recommended Message to Salesforce Support"))
+        w(
+            "We have completed a full audit of all Salesforce attachments and content files.\n\n"
+            "Salesforce is returning HTTP 200 (OK) responses for some Attachment Body requests but the "
+            "payload is zero bytes. This indicates that the binary content for these attachments has "
+            "been lost on Salesforce servers while the metadata remains intact.\n\n"
+            "These files cannot be recovered via API, user permissions, or client-side tooling. "
+            "Please advise whether Salesforce can restore these Attachment binaries from platform backups.\n\n"
         )
-    else:
-        ids_inline = ", ".join(r.get("Id", "") for r in retry_rows) or "None"
-    md += ids_inline + "\n\n"
-
-    # About / configuration section
-    md += _markdown_section("Export Context and Tool Information")
-    md += f"- Export directory: `{export_dir}`\n"
-    md += f"- Links directory: `{links}`\n"
-    md += f"- Salesforce instance: `{instance_url}`\n"
-    md += f"- sfdump version: `{sfdump_version}`\n"
-    md += f"- Report timestamp (UTC): `{datetime.utcnow().isoformat()}`\n\n"
-
-    # Write Markdown
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(md)
-
-    # Optional PDF conversion
+        if retry_ids:
+            if redact:
+                ids_inline = ", ".join(att_map.get(i, "ATTACHMENT") for i in retry_ids)
+            else:
+                ids_inline = ", ".join(retry_ids)
+            w("Affected Attachment Ids:\n\n" + ids_inline + "\n\n")
+
+        # About / configuration section
+        w(_markdown_section("Export Context and Tool Information"))
+        w(f"- Export directory: `{export_dir}`\n")
+        w(f"- Links directory: `{links}`\n")
+        w(f"- Salesforce instance: `{instance_url}`\n")
+        w(f"- sfdump version: `{sfdump_version}`\n")
+        w(f"- Report timestamp (UTC): `{generated_at}`\n\n")
+
+    # Optional PDF conversion (pandoc reads the Markdown file we just wrote)
     if pdf:
         try:
             import pypandoc
 
-            pypandoc.convert_text(
-                md,
+            pypandoc.convert_file(
+                md_path,
                 to="pdf",
                 format="md",
                 outputfile=pdf_path,
@@ -3,10 +3,13 @@ Retry helpers for missing Attachment and ContentVersion files.
 """
 
 import csv
+import itertools
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from tqdm import tqdm
 
@@ -16,6 +19,63 @@ DEFAULT_MAX_WORKERS = 16
 
 _logger = logging.getLogger(__name__)
 
+# (substring, retry_status) pairs checked in order; first match wins
+_ERR_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("403", "forbidden"),
+    ("404", "not-found"),
+    ("Connection", "connection-error"),
+    ("RemoteDisconnected", "connection-error"),
+)
+
+
+def _classify(err: str) -> str:
+    """Map a download error message to a retry_status value."""
+    return next((tag for pat, tag in _ERR_PATTERNS if pat in err), "unknown")
+
+
+# Attempts per file and base delay (seconds) for transient download failures
+DOWNLOAD_ATTEMPTS = 4
+BACKOFF_BASE = 0.5
+
+
+def _is_transient(err: str) -> bool:
+    """True for connection drops and 5xx responses, which are worth retrying."""
+    return _classify(err) == "connection-error" or " Server Error" in err
+
+
+def _attempt_download(
+    api,
+    rel_url: str,
+    out_path: str,
+    max_attempts: int = DOWNLOAD_ATTEMPTS,
+    base: float = BACKOFF_BASE,
+) -> int:
+    """
+    Download one file, retrying transient failures with exponential backoff and jitter.
+
+    RateLimitError and non-transient errors (403, 404, ...) are raised at once;
+    a transient error is raised only after the last attempt.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return api.download_path_to_file(rel_url, out_path)
+        except RateLimitError:
+            raise
+        except Exception as e:
+            if attempt == max_attempts - 1 or not _is_transient(str(e)):
+                raise
+            delay = base * (2**attempt) + random.uniform(0, base)
+            _logger.debug(
+                "Transient error on %s (attempt %d/%d), retrying in %.1fs: %s",
+                rel_url,
+                attempt + 1,
+                max_attempts,
+                delay,
+                e,
+            )
+            time.sleep(delay)
+    return 0
+
 
 def merge_recovered_into_metadata(
     original_csv: str,
@@ -56,31 +116,42 @@ def merge_recovered_into_metadata(
         _logger.info("No recovered files to merge from %s", retry_csv)
         return 0
 
-    # Load original CSV
-    rows = []
-    fieldnames = []
-    with open(original_csv, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames or []
-        rows = list(reader)
-
-    # Update paths for recovered files
+    # Stream the original CSV through a temp file, patching recovered paths
+    # as rows pass by; only the recovered-path lookup is held in memory.
+    tmp_csv = original_csv + ".tmp"
     updated_count = 0
-    for row in rows:
-        record_id = row.get(id_field, "")
-        if record_id in recovered_paths:
-            current_path = row.get(path_field, "")
-            # Only update if currently empty
-            if not current_path or current_path.strip() == "":
-                row[path_field] = recovered_paths[record_id]
-                updated_count += 1
-
-    # Write back
+    try:
+        with (
+            open(original_csv, newline="", encoding="utf-8") as src,
+            open(tmp_csv, "w", newline="", encoding="utf-8") as dst,
+        ):
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, [])
+            if id_field not in header or path_field not in header:
+                return 0
+            writer.writerow(header)
+            id_idx = header.index(id_field)
+            path_idx = header.index(path_field)
+            width = len(header)
+            for row in reader:
+                # Only the path cell is rewritten; other rows pass through as-is
+                if len(row) > id_idx and row[id_idx] in recovered_paths:
+                    if len(row) < width:
+                        row += [""] * (width - len(row))
+                    # Only update if currently empty
+                    if not row[path_idx].strip():
+                        row[path_idx] = recovered_paths[row[id_idx]]
+                        updated_count += 1
+                writer.writerow(row)
+
+        if updated_count > 0:
+            os.replace(tmp_csv, original_csv)
+    finally:
+        if os.path.exists(tmp_csv):
+            os.remove(tmp_csv)
+
     if updated_count > 0:
-        with open(original_csv, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
         _logger.info(
             "Merged %d recovered paths from %s into %s",
             updated_count,
@@ -103,8 +174,45 @@ def load_missing_csv(path: str) -> List[Dict[str, str]]:
     return rows
 
 
-def _write_retry_results(path: str, rows: List[dict], fieldnames: List[str]) -> None:
-    """Write the retry results to a CSV."""
+def _download_windowed(
+    executor: ThreadPoolExecutor,
+    api,
+    to_download: List[Tuple[dict, str, str]],
+    window: int,
+) -> Iterator[Tuple[Future, dict]]:
+    """
+    Submit downloads keeping at most ``window`` in flight, yielding each as it completes.
+
+    Only the in-flight futures are held, however many files are retried, and
+    if the caller stops early (e.g. on RateLimitError) at most ``window``
+    downloads are left to finish instead of the whole queue.
+    """
+    pending = iter(to_download)
+    inflight: Dict[Future, dict] = {}
+
+    def submit_next() -> bool:
+        for r, rel_url, out_path in pending:
+            inflight[executor.submit(_attempt_download, api, rel_url, out_path)] = r
+            return True
+        return False
+
+    while len(inflight) < window and submit_next():
+        pass
+    while inflight:
+        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+        for fut in done:
+            yield fut, inflight.pop(fut)
+            submit_next()
+
+
+def _split_paths(export_root: str, rel_path: str) -> Tuple[str, str]:
+    """Return ``(out_path, out_dir)`` for a file under ``export_root``."""
+    out_path = os.path.join(export_root, rel_path)
+    return out_path, os.path.dirname(out_path)
+
+
+def _write_retry_results(path: str, rows: Iterable[dict], fieldnames: List[str]) -> None:
+    """Write the retry results to a CSV, row by row as ``rows`` yields them."""
     with open(path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
@@ -112,178 +220,186 @@ def _write_retry_results(path: str, rows: List[dict], fieldnames: List[str]) ->
             writer.writerow(r)
 
 
-def retry_missing_attachments(
-    api, rows: List[dict], export_root: str, links_dir: str, max_workers: int = DEFAULT_MAX_WORKERS
-) -> None:
+def _peek_rows(rows: Iterable[dict]) -> Optional[Iterable[dict]]:
+    """Return ``rows`` unconsumed, or None if it yields nothing."""
+    it = iter(rows)
+    first = next(it, None)
+    if first is None:
+        return None
+    return itertools.chain((first,), it)
+
+
+def _retry_objects(
+    api,
+    rows: Iterable[dict],
+    export_root: str,
+    out_csv: str,
+    sobject: str,
+    body_attr: str,
+    pbar_desc: str,
+    max_workers: int,
+) -> Tuple[int, int]:
     """
-    Retry missing legacy Attachment downloads using parallel threads.
+    Retry downloads of ``sobject`` bodies in parallel, writing results to ``out_csv``.
 
     Args:
-        api: Salesforce API client
-        rows: List of missing attachment rows from verify
-        export_root: Root export directory
-        links_dir: Directory for link CSVs
-        max_workers: Number of parallel download threads (default 8)
-    """
-    if not rows:
-        _logger.info("retry_missing_attachments: No missing attachment rows.")
-        return
+        sobject: Salesforce object name (``"Attachment"`` or ``"ContentVersion"``)
+        body_attr: Binary field to fetch (``"Body"`` or ``"VersionData"``)
+        pbar_desc: Progress bar label
+
+    Returns:
+        Tuple of (rows processed, rows still missing)
 
-    results = []
+    Raises:
+        RateLimitError: The org's API limit was hit. Nothing is returned;
+            rows finished before the limit are already written to ``out_csv``.
+    """
+    url_prefix = f"/services/data/{api.api_version}/sobjects/{sobject}/"
+    url_suffix = f"/{body_attr}"
+    invalid = []
+    fields = {"retry_status", "retry_error", "retry_success"}
 
     # First pass: prepare downloads and filter invalid rows
     to_download = []
+    out_dirs = set()
     for r in rows:
-        attach_id = r.get("Id")
+        fields.update(r)
         rel_path = r.get("path") or ""
-        out_path = os.path.join(export_root, rel_path) if rel_path else None
 
-        if not out_path:
+        if not rel_path:
             r["retry_status"] = "invalid-path"
             r["retry_error"] = "Missing path in metadata"
-            results.append(r)
+            invalid.append(r)
             continue
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-        # Reconstruct Body URL
-        rel_url = f"/services/data/{api.api_version}/sobjects/Attachment/{attach_id}/Body"
+        out_path, out_dir = _split_paths(export_root, rel_path)
+        out_dirs.add(out_dir)
+        rel_url = f"{url_prefix}{r.get('Id')}{url_suffix}"
         to_download.append((r, rel_url, out_path))
 
-    # Parallel download phase
-    if to_download:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(api.download_path_to_file, rel_url, out_path): (r, out_path)
-                for r, rel_url, out_path in to_download
-            }
+    # Create each output directory once, not once per file
+    for out_dir in out_dirs:
+        os.makedirs(out_dir, exist_ok=True)
+
+    recovered = 0
 
+    def results() -> Iterator[dict]:
+        nonlocal recovered
+        yield from invalid
+        if not to_download:
+            return
+        # Parallel download phase; each row is yielded (and written) as it completes
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             pbar = tqdm(
-                as_completed(futures),
-                total=len(futures),
-                desc="        Attachments",
+                _download_windowed(executor, api, to_download, max_workers * 4),
+                total=len(to_download),
+                desc=pbar_desc,
                 unit="file",
                 ncols=80,
             )
 
-            for fut in pbar:
-                r, out_path = futures[fut]
+            for fut, r in pbar:
                 try:
                     fut.result()
                     r["retry_success"] = "true"
                     r["retry_error"] = ""
                     r["retry_status"] = "recovered"
+                    recovered += 1
                 except RateLimitError:
                     raise  # Stop immediately on rate limit
                 except Exception as e:
                     err = str(e)
                     r["retry_success"] = "false"
                     r["retry_error"] = err
-                    if "403" in err:
-                        r["retry_status"] = "forbidden"
-                    elif "404" in err:
-                        r["retry_status"] = "not-found"
-                    elif "Connection" in err or "RemoteDisconnected" in err:
-                        r["retry_status"] = "connection-error"
-                    else:
-                        r["retry_status"] = "unknown"
-                results.append(r)
+                    r["retry_status"] = _classify(err)
+                yield r
+
+    _write_retry_results(out_csv, results(), sorted(fields))
+
+    total = len(invalid) + len(to_download)
+    return total, total - recovered
+
+
+def retry_missing_attachments(
+    api,
+    rows: Iterable[dict],
+    export_root: str,
+    links_dir: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int:
+    """
+    Retry missing legacy Attachment downloads using parallel threads.
+
+    Args:
+        api: Salesforce API client
+        rows: Missing attachment rows from verify (any iterable, consumed once)
+        export_root: Root export directory
+        links_dir: Directory for link CSVs
+        max_workers: Number of parallel download threads (default 16)
+
+    Returns:
+        Number of rows still missing after the retry
+    """
+    rows = _peek_rows(rows)
+    if rows is None:
+        _logger.info("retry_missing_attachments: No missing attachment rows.")
+        return 0
 
     out_csv = os.path.join(links_dir, "attachments_missing_retry.csv")
-    fieldnames = sorted({k for r in results for k in r.keys()})
-    _write_retry_results(out_csv, results, fieldnames)
+    total, missing = _retry_objects(
+        api, rows, export_root, out_csv, "Attachment", "Body", "        Attachments", max_workers
+    )
 
     _logger.info(
         "retry_missing_attachments: wrote retry results for %d rows → %s",
-        len(results),
+        total,
         out_csv,
     )
 
+    return missing
+
 
 def retry_missing_content_versions(
-    api, rows: List[dict], export_root: str, links_dir: str, max_workers: int = DEFAULT_MAX_WORKERS
-) -> None:
+    api,
+    rows: Iterable[dict],
+    export_root: str,
+    links_dir: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int:
     """
     Retry missing ContentVersion downloads using parallel threads.
 
     Args:
         api: Salesforce API client
-        rows: List of missing content version rows from verify
+        rows: Missing content version rows from verify (any iterable, consumed once)
         export_root: Root export directory
         links_dir: Directory for link CSVs
-        max_workers: Number of parallel download threads (default 8)
+        max_workers: Number of parallel download threads (default 16)
+
+    Returns:
+        Number of rows still missing after the retry
     """
-    if not rows:
+    rows = _peek_rows(rows)
+    if rows is None:
         _logger.info("retry_missing_content_versions: No missing CV rows.")
-        return
-
-    results = []
-
-    # First pass: prepare downloads and filter invalid rows
-    to_download = []
-    for r in rows:
-        cv_id = r.get("Id")
-        rel_path = r.get("path") or ""
-        out_path = os.path.join(export_root, rel_path) if rel_path else None
-
-        if not out_path:
-            r["retry_status"] = "invalid-path"
-            r["retry_error"] = "Missing path in metadata"
-            results.append(r)
-            continue
-
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-        # Reconstruct VersionData URL
-        rel_url = f"/services/data/{api.api_version}/sobjects/ContentVersion/{cv_id}/VersionData"
-        to_download.append((r, rel_url, out_path))
-
-    # Parallel download phase
-    if to_download:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(api.download_path_to_file, rel_url, out_path): (r, out_path)
-                for r, rel_url, out_path in to_download
-            }
-
-            pbar = tqdm(
-                as_completed(futures),
-                total=len(futures),
-                desc="        Documents",
-                unit="file",
-                ncols=80,
-            )
-
-            for fut in pbar:
-                r, out_path = futures[fut]
-                try:
-                    fut.result()
-                    r["retry_success"] = "true"
-                    r["retry_error"] = ""
-                    r["retry_status"] = "recovered"
-                except RateLimitError:
-                    raise  # Stop immediately on rate limit
-                except Exception as e:
-                    err = str(e)
-                    r["retry_success"] = "false"
-                    r["retry_error"] = err
-                    if "403" in err:
-                        r["retry_status"] = "forbidden"
-                    elif "404" in err:
-                        r["retry_status"] = "not-found"
-                    elif "Connection" in err or "RemoteDisconnected" in err:
-                        r["retry_status"] = "connection-error"
-                    else:
-                        r["retry_status"] = "unknown"
-                results.append(r)
+        return 0
 
     out_csv = os.path.join(links_dir, "content_versions_missing_retry.csv")
-    fieldnames = sorted({k for r in results for k in r.keys()})
-    _write_retry_results(out_csv, results, fieldnames)
+    total, missing = _retry_objects(
+        api,
+        rows,
+        export_root,
+        out_csv,
+        "ContentVersion",
+        "VersionData",
+        "        Documents",
+        max_workers,
+    )
 
     _logger.info(
         "retry_missing_content_versions: wrote retry results for %d rows → %s",
-        len(results),
+        total,
         out_csv,
     )
+
+    return missing
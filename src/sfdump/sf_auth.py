@@ -18,13 +18,24 @@ def _require_env(name: str) -> str:
 
 CACHE_FILE = Path.home() / ".sfdump_token.json"
 
+# Shared session so the token request and queries reuse pooled connections
+_SESSION = requests.Session()
+
+# In-process copy of the cached token: (cache file, access token, expires_at)
+_TOKEN_MEMO: tuple[Path, str, float] | None = None
+
 
 def _load_cached_token() -> str | None:
     """Return cached token if still valid, else None."""
+    global _TOKEN_MEMO
+    now = time.time()
+    if _TOKEN_MEMO and _TOKEN_MEMO[0] == CACHE_FILE and _TOKEN_MEMO[2] > now:
+        return _TOKEN_MEMO[1]
     if CACHE_FILE.exists():
         try:
-            data = json.loads(CACHE_FILE.read_text())
-            if data["expires_at"] > time.time():
+            data = json.loads(CACHE_FILE.read_bytes())
+            if data["expires_at"] > now:
+                _TOKEN_MEMO = (CACHE_FILE, data["access_token"], data["expires_at"])
                 return data["access_token"]
         except Exception:
             pass
@@ -33,14 +44,10 @@ def _load_cached_token() -> str | None:
 
 def _save_cached_token(token: str, expires_in: int) -> None:
     """Save token and expiry timestamp to disk."""
-    CACHE_FILE.write_text(
-        json.dumps(
-            {
-                "access_token": token,
-                "expires_at": time.time() + expires_in - 60,  # 1 min safety margin
-            }
-        )
-    )
+    global _TOKEN_MEMO
+    expires_at = time.time() + expires_in - 60  # 1 min safety margin
+    CACHE_FILE.write_text(json.dumps({"access_token": token, "expires_at": expires_at}))
+    _TOKEN_MEMO = (CACHE_FILE, token, expires_at)
 
 
 def get_salesforce_token() -> str:
@@ -54,7 +61,7 @@ def get_salesforce_token() -> str:
     client_id = _require_env("SF_CLIENT_ID")
     client_secret = _require_env("SF_CLIENT_SECRET")
 
-    resp = requests.post(
+    resp = _SESSION.post(
         f"{login_url}/services/oauth2/token",
         data={
             "grant_type": "client_credentials",
@@ -73,14 +80,12 @@ def get_salesforce_token() -> str:
 
 
 def run_salesforce_query(soql: str) -> dict:
-    from urllib.parse import quote
-
     access_token = get_salesforce_token()
     login_url = _require_env("SF_LOGIN_URL")
     api_version = os.getenv("SF_API_VERSION", "v60.0")
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = f"{login_url}/services/data/{api_version}/query?q={quote(soql)}"
-    r = requests.get(url, headers=headers)
+    url = f"{login_url}/services/data/{api_version}/query"
+    r = _SESSION.get(url, params={"q": soql}, headers=headers)
     if r.status_code >= 400:
         try:
             detail = r.json()
@@ -18,7 +18,7 @@ import secrets
 import threading
 import time
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlparse
 
@@ -32,6 +32,9 @@ CALLBACK_PATH = "/callback"
 REDIRECT_URI = f"http://localhost:{CALLBACK_PORT}{CALLBACK_PATH}"
 TOKEN_FILE = Path.home() / ".sfdump_web_token.json"
 
+# In-process copy of the cached token data: (token file, data incl. expires_at)
+_TOKEN_MEMO: tuple[Path, dict] | None = None
+
 
 def _require_env(name: str) -> str:
     v = os.getenv(name)
@@ -63,10 +66,15 @@ def _generate_code_challenge(verifier: str) -> str:
 
 def _load_cached_token() -> dict | None:
     """Return cached token data if access_token is still valid, else None."""
+    global _TOKEN_MEMO
+    now = time.time()
+    if _TOKEN_MEMO and _TOKEN_MEMO[0] == TOKEN_FILE and _TOKEN_MEMO[1]["expires_at"] > now:
+        return _TOKEN_MEMO[1]
     if TOKEN_FILE.exists():
         try:
-            data = json.loads(TOKEN_FILE.read_text())
-            if data.get("expires_at", 0) > time.time():
+            data = json.loads(TOKEN_FILE.read_bytes())
+            if data.get("expires_at", 0) > now:
+                _TOKEN_MEMO = (TOKEN_FILE, data)
                 return data
         except Exception:
             pass
@@ -75,15 +83,17 @@ def _load_cached_token() -> dict | None:
 
 def _save_token(data: dict, expires_in: int) -> None:
     """Save token data with expiry timestamp."""
+    global _TOKEN_MEMO
     data["expires_at"] = time.time() + expires_in - 60  # 1 min safety margin
     TOKEN_FILE.write_text(json.dumps(data, indent=2))
+    _TOKEN_MEMO = (TOKEN_FILE, data)
 
 
 def load_refresh_token() -> str | None:
     """Return the stored refresh token, if any."""
     if TOKEN_FILE.exists():
         try:
-            data = json.loads(TOKEN_FILE.read_text())
+            data = json.loads(TOKEN_FILE.read_bytes())
             return data.get("refresh_token")
         except Exception:
             pass
@@ -97,7 +107,7 @@ def get_instance_url() -> str:
     """
     if TOKEN_FILE.exists():
         try:
-            data = json.loads(TOKEN_FILE.read_text())
+            data = json.loads(TOKEN_FILE.read_bytes())
             url = data.get("instance_url")
             if url:
                 return url
@@ -144,6 +154,7 @@ class _CallbackHandler(BaseHTTPRequestHandler):
 
     auth_code: str | None = None
     error: str | None = None
+    done = threading.Event()  # set once a code or error has arrived
 
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
@@ -156,6 +167,8 @@ class _CallbackHandler(BaseHTTPRequestHandler):
 
         if "error" in params:
             _CallbackHandler.error = params["error"][0]
+            _CallbackHandler.done.set()
+            self._stop_server()
             body = (
                 f"<h2>Authorization failed</h2><p>{params['error'][0]}: "
                 f"{params.get('error_description', [''])[0]}</p>"
@@ -169,6 +182,8 @@ class _CallbackHandler(BaseHTTPRequestHandler):
 
         if "code" in params:
             _CallbackHandler.auth_code = params["code"][0]
+            _CallbackHandler.done.set()
+            self._stop_server()
             body = (
                 "<h2>Login successful!</h2>"
                 "<p>You can close this tab and return to the terminal.</p>"
@@ -184,6 +199,14 @@ class _CallbackHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(b"<h2>Missing authorization code</h2>")
 
+    def _stop_server(self) -> None:
+        """Stop serving once the callback has arrived, freeing the port early.
+
+        shutdown() blocks until serve_forever() returns, so it runs on its own
+        thread to let this handler finish its response first.
+        """
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
     def log_message(self, format: str, *args: object) -> None:  # noqa: A002
         """Suppress default HTTP server logging."""
 
@@ -245,9 +268,10 @@ def interactive_login() -> str:
     # Reset handler state
     _CallbackHandler.auth_code = None
     _CallbackHandler.error = None
+    _CallbackHandler.done.clear()
 
     # Start local server
-    server = HTTPServer(("localhost", CALLBACK_PORT), _CallbackHandler)
+    server = ThreadingHTTPServer(("localhost", CALLBACK_PORT), _CallbackHandler)
     server.timeout = 0.5
     server_thread = threading.Thread(target=server.serve_forever, daemon=True)
     server_thread.start()
@@ -282,12 +306,12 @@ def interactive_login() -> str:
         print()
 
         # Wait for callback (timeout after 300 seconds — longer for manual URL copy)
-        # KeyboardInterrupt propagates immediately from the short sleep
+        # The handler wakes us as soon as it sets the event; the short wait slices
+        # keep KeyboardInterrupt responsive on Windows, where a plain wait() blocks it
         deadline = time.time() + 300
-        while _CallbackHandler.auth_code is None and _CallbackHandler.error is None:
+        while not _CallbackHandler.done.wait(0.5):
             if time.time() > deadline:
                 raise RuntimeError("Login timed out after 300 seconds")
-            time.sleep(0.1)
 
         if _CallbackHandler.error:
             raise RuntimeError(f"Authorization failed: {_CallbackHandler.error}")
@@ -296,7 +320,9 @@ def interactive_login() -> str:
     except KeyboardInterrupt:
         raise
     finally:
+        # No-op if the handler already stopped it; needed on timeout/interrupt
         server.shutdown()
+        server.server_close()
 
     # Exchange authorization code for tokens
     resp = requests.post(
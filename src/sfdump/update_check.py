@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import json
 import re
+import time
+from functools import lru_cache
+from pathlib import Path
 
 import requests
+from packaging.version import InvalidVersion, Version
 
 from . import __version__
 
 PYPI_URL = "https://pypi.org/pypi/sfdump/json"
+UPDATE_CACHE_FILE = Path.home() / ".sfdump_update_cache.json"
+UPDATE_CACHE_TTL = 6 * 3600  # seconds
 
+_SUFFIX_RE = re.compile(r"(\.dev|\.post|\+)")
 
+
+@lru_cache(maxsize=128)
 def _parse_version(v: str) -> tuple[int, ...]:
     """Strip dev/post/local suffixes and return an int tuple for comparison."""
-    v = re.split(r"(\.dev|\.post|\+)", v)[0]
+    v = _SUFFIX_RE.split(v)[0]
     parts: list[int] = []
     for segment in v.lstrip("v").split("."):
         try:
@@ -21,11 +31,46 @@ def _parse_version(v: str) -> tuple[int, ...]:
     return tuple(parts)
 
 
-def get_latest_release() -> dict | None:
+def _is_newer(latest: str, current: str) -> bool:
+    """Compare per PEP 440, falling back to _parse_version for non-PEP 440 strings."""
+    try:
+        return Version(latest) > Version(current)
+    except InvalidVersion:
+        return _parse_version(latest) > _parse_version(current)
+
+
+def _load_cached_release() -> dict | None:
+    """Return the cached release if fetched within the TTL, else None."""
+    try:
+        data = json.loads(UPDATE_CACHE_FILE.read_text())
+        if data["fetched_at"] + UPDATE_CACHE_TTL > time.time():
+            return data["release"]
+    except Exception:
+        pass
+    return None
+
+
+def _save_cached_release(release: dict) -> None:
+    """Save the release and fetch time; failures are ignored."""
+    try:
+        UPDATE_CACHE_FILE.write_text(json.dumps({"fetched_at": time.time(), "release": release}))
+    except OSError:
+        pass
+
+
+def get_latest_release(*, use_cache: bool = True) -> dict | None:
     """Fetch latest version from PyPI.
 
+    A successful lookup is cached on disk for ``UPDATE_CACHE_TTL`` seconds;
+    pass ``use_cache=False`` to always ask PyPI.
+
     Returns ``{"version": "..."}`` or *None* on any error.
     """
+    if use_cache:
+        cached = _load_cached_release()
+        if cached:
+            return cached
+
     try:
         resp = requests.get(PYPI_URL, timeout=5)
         resp.raise_for_status()
@@ -38,22 +83,24 @@ def get_latest_release() -> dict | None:
     except Exception:
         return None
 
-    return {"version": version}
+    release = {"version": version}
+    _save_cached_release(release)
+    return release
 
 
-def is_update_available() -> tuple[bool, str, str]:
+def is_update_available(*, use_cache: bool = True) -> tuple[bool, str, str]:
     """Check whether a newer release exists on PyPI.
 
     Returns ``(available, current_version, latest_version)``.
     On network errors returns ``(False, current, "")``.
     """
     current = __version__
-    release = get_latest_release()
+    release = get_latest_release(use_cache=use_cache)
     if release is None:
         return False, current, ""
     latest = release["version"]
     try:
-        available = _parse_version(latest) > _parse_version(current)
+        available = _is_newer(latest, current)
     except Exception:
         return False, current, latest
     return available, current, latest
@@ -27,11 +27,15 @@ def sanitize_filename(name: str, repl: str = "_") -> str:
 def sha256_of_file(path: str, chunk_size: int = 1024 * 1024) -> str:
     """
     Streaming SHA-256 of a file to avoid loading it fully into memory.
+
+    Reads into one reused buffer, so no new bytes object is allocated per chunk.
     """
     h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
     return h.hexdigest()
 
 
@@ -3,22 +3,19 @@ Verification helpers for exported files.
 """
 
 import csv
-import hashlib
 import logging
 import os
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from .utils import sha256_of_file
+
 _logger = logging.getLogger(__name__)
 
 
 def _sha256_of_file(path: str) -> str:
     """Compute SHA256 of a file with buffered reading."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return sha256_of_file(path)
 
 
 def _load_csv(path: str) -> List[Dict[str, str]]:
@@ -86,50 +83,83 @@ def _verify_rows(rows: List[dict], export_root: str) -> Tuple[List[dict], List[d
     return missing, corrupt
 
 
-def verify_attachments(meta_csv: str, export_root: str) -> None:
-    """Verify exported legacy Attachment binaries."""
+def _verify_metadata(
+    meta_csv: str, export_root: str, stem: str, label: str
+) -> Tuple[List[dict], str]:
+    """
+    Verify the files listed in a metadata CSV and write the missing/corrupt reports.
+
+    Returns (missing_rows, missing_csv_path). The missing CSV is only
+    written when there are missing rows.
+    """
     rows = _load_csv(meta_csv)
     missing, corrupt = _verify_rows(rows, export_root)
 
     links_dir = os.path.dirname(meta_csv)
 
-    missing_csv = os.path.join(links_dir, "attachments_missing.csv")
-    corrupt_csv = os.path.join(links_dir, "attachments_corrupt.csv")
+    missing_csv = os.path.join(links_dir, f"{stem}_missing.csv")
+    corrupt_csv = os.path.join(links_dir, f"{stem}_corrupt.csv")
 
     if missing:
         _write_csv(missing_csv, missing, sorted(missing[0].keys()))
-        _logger.info("Attachment verification: %d missing files", len(missing))
+        _logger.info("%s verification: %d missing files", label, len(missing))
     else:
-        _logger.debug("Attachment verification: all files present")
+        _logger.debug("%s verification: all files present", label)
 
     if corrupt:
         _write_csv(corrupt_csv, corrupt, sorted(corrupt[0].keys()))
-        _logger.info("Attachment verification: %d corrupt files", len(corrupt))
+        _logger.info("%s verification: %d corrupt files", label, len(corrupt))
     else:
-        _logger.debug("Attachment verification: no corrupt files")
+        _logger.debug("%s verification: no corrupt files", label)
 
+    return missing, missing_csv
 
-def verify_content_versions(meta_csv: str, export_root: str) -> None:
-    """Verify exported ContentVersion binaries."""
-    rows = _load_csv(meta_csv)
-    missing, corrupt = _verify_rows(rows, export_root)
 
-    links_dir = os.path.dirname(meta_csv)
+def verify_attachments(meta_csv: str, export_root: str) -> Tuple[int, str]:
+    """
+    Verify exported legacy Attachment binaries.
 
-    missing_csv = os.path.join(links_dir, "content_versions_missing.csv")
-    corrupt_csv = os.path.join(links_dir, "content_versions_corrupt.csv")
+    Returns (missing_count, missing_csv_path). The missing CSV is only
+    written when missing_count > 0.
+    """
+    missing, missing_csv = _verify_metadata(meta_csv, export_root, "attachments", "Attachment")
+    return len(missing), missing_csv
 
-    if missing:
-        _write_csv(missing_csv, missing, sorted(missing[0].keys()))
-        _logger.info("ContentVersion verification: %d missing files", len(missing))
-    else:
-        _logger.debug("ContentVersion verification: all files present")
 
-    if corrupt:
-        _write_csv(corrupt_csv, corrupt, sorted(corrupt[0].keys()))
-        _logger.info("ContentVersion verification: %d corrupt files", len(corrupt))
-    else:
-        _logger.debug("ContentVersion verification: no corrupt files")
+def verify_attachments_rows(meta_csv: str, export_root: str) -> List[dict]:
+    """
+    Verify exported legacy Attachment binaries and return the missing rows.
+
+    Same checks and report CSVs as :func:`verify_attachments`, but the
+    missing rows are handed back directly so callers (e.g. retry) don't
+    have to re-read attachments_missing.csv.
+    """
+    missing, _ = _verify_metadata(meta_csv, export_root, "attachments", "Attachment")
+    return missing
+
+
+def verify_content_versions(meta_csv: str, export_root: str) -> Tuple[int, str]:
+    """
+    Verify exported ContentVersion binaries.
+
+    Returns (missing_count, missing_csv_path). The missing CSV is only
+    written when missing_count > 0.
+    """
+    missing, missing_csv = _verify_metadata(
+        meta_csv, export_root, "content_versions", "ContentVersion"
+    )
+    return len(missing), missing_csv
+
+
+def verify_content_versions_rows(meta_csv: str, export_root: str) -> List[dict]:
+    """
+    Verify exported ContentVersion binaries and return the missing rows.
+
+    Same checks and report CSVs as :func:`verify_content_versions`, with
+    the missing rows returned instead of re-read from disk.
+    """
+    missing, _ = _verify_metadata(meta_csv, export_root, "content_versions", "ContentVersion")
+    return missing
 
 
 def load_missing_csv(path: Path) -> list[dict]:
@@ -13,9 +13,10 @@ from __future__ import annotations
 
 import csv
 import logging
+import os
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
 from sfdump.indexing import SFObject, iter_objects
 from sfdump.indexing.build_record_documents import build_record_documents
@@ -29,6 +30,57 @@ from .sqlite_schema import (
 
 LOG = logging.getLogger(__name__)
 
+# Optional PRAGMA overrides applied right after connecting, set by callers that
+# want a faster build (see orchestrator's SFDUMP_FAST_SQLITE). Safe because the
+# database is always rebuildable from the CSVs. Values are validated against
+# the allowed set so nothing from the environment reaches SQL unchecked.
+_PRAGMA_ENV_VARS: dict[str, tuple[str, frozenset[str] | None]] = {
+    "SFDUMP_SQLITE_PRAGMA_JOURNAL": (
+        "journal_mode",
+        frozenset({"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}),
+    ),
+    "SFDUMP_SQLITE_PRAGMA_SYNC": (
+        "synchronous",
+        frozenset({"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"}),
+    ),
+    "SFDUMP_SQLITE_PRAGMA_TEMP": (
+        "temp_store",
+        frozenset({"DEFAULT", "FILE", "MEMORY", "0", "1", "2"}),
+    ),
+    # cache_size takes any integer (negative = KiB)
+    "SFDUMP_SQLITE_PRAGMA_CACHE": ("cache_size", None),
+}
+
+
+def _apply_env_pragmas(conn: sqlite3.Connection, log: logging.Logger) -> None:
+    """Apply PRAGMA overrides from SFDUMP_SQLITE_PRAGMA_* env vars, if any."""
+    for env_var, (pragma, allowed) in _PRAGMA_ENV_VARS.items():
+        value = os.environ.get(env_var, "").strip().upper()
+        if not value:
+            continue
+        if allowed is None:
+            try:
+                value = str(int(value))
+            except ValueError:
+                value = ""
+        elif value not in allowed:
+            value = ""
+        if not value:
+            log.warning("Ignoring invalid %s=%r", env_var, os.environ.get(env_var))
+            continue
+        log.debug("PRAGMA %s = %s", pragma, value)
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+def _fit_rows(rows: Iterable[list[str]], width: int) -> Iterator[list[str]]:
+    """Pad or truncate CSV rows to the header width (tolerates ragged rows)."""
+    for row in rows:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        elif len(row) > width:
+            row = row[:width]
+        yield row
+
 
 def _find_csv_for_object(
     export_root: Path, obj: SFObject, table_cfg: SqliteTableConfig
@@ -168,9 +220,13 @@ def build_sqlite_from_export(
         index_configs = default_index_configs()
 
     log.info("Creating SQLite database at %s", db_path)
-    conn = sqlite3.connect(str(db_path))
+    # Autocommit mode so the whole load can run in one explicit transaction
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
     try:
+        # PRAGMAs first: journal_mode can't change inside a transaction
+        _apply_env_pragmas(conn, log)
         cur = conn.cursor()
+        cur.execute("BEGIN")
         created_tables: set[str] = set()
 
         # Load each object's CSV into its own table
@@ -214,15 +270,9 @@ def build_sqlite_from_export(
                     f'INSERT INTO "{table_cfg.table_name}" ({col_list_sql}) VALUES ({placeholders})'
                 )
 
-                for row in reader:
-                    # Be tolerant of short/long rows by padding/truncating
-                    if len(row) < len(header):
-                        row = row + [""] * (len(header) - len(row))
-                    elif len(row) > len(header):
-                        row = row[: len(header)]
-                    cur.execute(insert_sql, row)
+                cur.executemany(insert_sql, _fit_rows(reader, len(header)))
 
-        # Create indexes based on relationships, but only for tables we actually created
+        # Create indexes after the bulk load, and only for tables we actually created
         for idx in index_configs:
             if idx.table not in created_tables:
                 log.info(
@@ -243,8 +293,9 @@ def build_sqlite_from_export(
         # Viewer configuration table (used by set-password, build-db --hr-password)
         cur.execute("CREATE TABLE IF NOT EXISTS viewer_config (key TEXT PRIMARY KEY, value TEXT)")
 
-        conn.commit()
+        cur.execute("COMMIT")
     finally:
+        # Closing without COMMIT rolls back a failed load
         conn.close()
 
     build_record_documents(db_path=db_path, export_root=export_dir)
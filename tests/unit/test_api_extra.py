@@ -69,6 +69,8 @@ def test_download_path_to_file_streams_to_disk(tmp_path: Path, monkeypatch) -> N
     urls_seen: list[str] = []
 
     class DummyResponse:
+        status_code = 200
+
         def __enter__(self_inner):
             return self_inner
 
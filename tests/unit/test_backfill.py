@@ -6,6 +6,8 @@ from unittest.mock import MagicMock
 from sfdump.backfill import (
     BackfillResult,
     _safe_filename,
+    count_missing_in_index,
+    iter_missing_in_index,
     load_missing_from_index,
     resolve_content_version_id,
     run_backfill,
@@ -118,6 +120,52 @@ class TestLoadMissingFromIndex:
         assert all(r["file_id"].startswith(("069", "068")) for r in result)
 
 
+class TestStreamMissingFromIndex:
+    """Tests for iter_missing_in_index and count_missing_in_index."""
+
+    def test_iter_is_lazy_and_matches_load(self, tmp_path):
+        """Yields the same rows as load_missing_from_index, one at a time."""
+        index_path = tmp_path / "index.csv"
+        index_path.write_text(
+            "file_id,file_name,file_extension,file_source,local_path\n"
+            "069ABC,doc1,pdf,File,\n"
+            "069DEF,doc2,pdf,File,files/06/doc2.pdf\n"
+            "068GHI,doc3,docx,File,\n"
+        )
+
+        it = iter_missing_in_index(index_path)
+
+        assert next(it)["file_id"] == "069ABC"
+        assert [r["file_id"] for r in it] == ["068GHI"]
+
+    def test_count_missing(self, tmp_path):
+        """Counts rows needing backfill without loading them."""
+        index_path = tmp_path / "index.csv"
+        index_path.write_text(
+            "file_id,file_name,file_extension,file_source,local_path\n"
+            "069ABC,doc1,pdf,File,\n"
+            "00P123,attach,jpg,Attachment,\n"
+            "068GHI,doc3,docx,File,\n"
+        )
+
+        assert count_missing_in_index(index_path) == 2
+
+    def test_count_matches_iter_on_ragged_rows(self, tmp_path):
+        """Short rows and a missing local_path column count like the dict-based filter."""
+        ragged = tmp_path / "ragged.csv"
+        ragged.write_text("file_id,file_source,local_path\n069ABC,File\n068DEF,File,files/x.pdf\n")
+        no_path = tmp_path / "no_path.csv"
+        no_path.write_text("file_id,file_source\n069ABC,File\n00P1,Attachment\n")
+
+        for index_path in (ragged, no_path):
+            expected = sum(1 for _ in iter_missing_in_index(index_path))
+            assert count_missing_in_index(index_path) == expected == 1
+
+    def test_count_nonexistent_is_zero(self, tmp_path):
+        """Returns 0 when the index doesn't exist."""
+        assert count_missing_in_index(tmp_path / "nonexistent.csv") == 0
+
+
 class TestResolveContentVersionId:
     """Tests for resolve_content_version_id function."""
 
@@ -373,6 +421,8 @@ class TestRunBackfill:
 
         # Should be called at 2, 4, and 5 (final)
         assert len(callback_calls) >= 2
+        assert [c[0] for c in callback_calls] == [2, 4, 5]
+        assert all(c[1] == 5 for c in callback_calls)
 
     def test_handles_068_ids_directly(self, tmp_path):
         """Handles 068 ContentVersion IDs without resolution."""
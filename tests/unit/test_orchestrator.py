@@ -0,0 +1,574 @@
+"""Tests for sfdump.orchestrator helpers."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from sfdump import orchestrator
+from sfdump.orchestrator import (
+    find_latest_export,
+    get_default_export_path,
+    invalidate_export_cache,
+)
+
+
+class TestFindLatestExport:
+    """Tests for find_latest_export and its cache."""
+
+    def setup_method(self):
+        invalidate_export_cache()
+
+    def test_returns_none_when_base_missing(self, tmp_path):
+        """Returns None when the exports directory doesn't exist."""
+        assert find_latest_export(tmp_path / "exports") is None
+
+    def test_returns_newest_export(self, tmp_path):
+        """Picks the lexicographically newest export-* directory."""
+        (tmp_path / "export-2025-01-01").mkdir()
+        (tmp_path / "export-2025-03-01").mkdir()
+        (tmp_path / "other").mkdir()
+        (tmp_path / "export-2025-09-09.txt").write_text("not a dir")
+
+        assert find_latest_export(tmp_path) == tmp_path / "export-2025-03-01"
+
+    def test_cached_until_invalidated(self, tmp_path, monkeypatch):
+        """A new export is only seen after invalidate_export_cache()."""
+        monkeypatch.setattr(orchestrator.time, "time", lambda: 1_000_000.0)
+        (tmp_path / "export-2025-01-01").mkdir()
+        assert find_latest_export(tmp_path) == tmp_path / "export-2025-01-01"
+
+        (tmp_path / "export-2025-02-01").mkdir()
+        assert find_latest_export(tmp_path) == tmp_path / "export-2025-01-01"
+
+        invalidate_export_cache()
+        assert find_latest_export(tmp_path) == tmp_path / "export-2025-02-01"
+
+
+def test_default_export_path_is_dated():
+    """Default export path is ./exports/export-YYYY-MM-DD."""
+    path = get_default_export_path()
+    assert path.parent.name == "exports"
+    assert path.name.startswith("export-")
+
+
+class TestObjectLists:
+    """Tests for the module-level object lists."""
+
+    def test_lists_are_immutable_and_unique(self):
+        """Object lists are tuples with no duplicate entries."""
+        for objs, objs_set in (
+            (orchestrator.ESSENTIAL_OBJECTS, orchestrator.ESSENTIAL_OBJECTS_SET),
+            (orchestrator.ESSENTIAL_OBJECTS_LIGHT, orchestrator.ESSENTIAL_OBJECTS_LIGHT_SET),
+            (orchestrator.FILE_INDEX_OBJECTS, orchestrator.FILE_INDEX_OBJECTS_SET),
+        ):
+            assert isinstance(objs, tuple)
+            assert len(objs) == len(objs_set)
+            assert frozenset(objs) == objs_set
+
+    def test_light_file_index_objects(self):
+        """Light mode indexes only file-index objects it also exports, in order."""
+        assert orchestrator.FILE_INDEX_OBJECTS_LIGHT == (
+            "Opportunity",
+            "Account",
+            "c2g__codaInvoice__c",
+            "c2g__codaPurchaseInvoice__c",
+        )
+
+    def test_light_is_subset_of_essential(self):
+        """Every light-mode object is also an essential object."""
+        assert orchestrator.ESSENTIAL_OBJECTS_LIGHT_SET <= orchestrator.ESSENTIAL_OBJECTS_SET
+
+
+class TestSqliteBuildEnv:
+    """Tests for the opt-in fast SQLite build environment."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Without SFDUMP_FAST_SQLITE the PRAGMA env vars are untouched."""
+        monkeypatch.delenv("SFDUMP_FAST_SQLITE", raising=False)
+        monkeypatch.delenv("SFDUMP_SQLITE_PRAGMA_SYNC", raising=False)
+        with orchestrator._sqlite_build_env():
+            assert "SFDUMP_SQLITE_PRAGMA_SYNC" not in os.environ
+
+    def test_enabled_and_restored(self, monkeypatch):
+        """With SFDUMP_FAST_SQLITE=1 the PRAGMA vars apply only inside the block."""
+        monkeypatch.setenv("SFDUMP_FAST_SQLITE", "1")
+        monkeypatch.setenv("SFDUMP_SQLITE_PRAGMA_SYNC", "FULL")
+        with orchestrator._sqlite_build_env():
+            assert os.environ["SFDUMP_SQLITE_PRAGMA_SYNC"] == "OFF"
+            assert os.environ["SFDUMP_SQLITE_PRAGMA_JOURNAL"] == "WAL"
+        assert os.environ["SFDUMP_SQLITE_PRAGMA_SYNC"] == "FULL"
+        assert "SFDUMP_SQLITE_PRAGMA_JOURNAL" not in os.environ
+
+
+class TestBackgroundCsvWorkers:
+    """Tests for sizing the CSV export that overlaps Step 2's downloads."""
+
+    def test_fits_within_connection_pool(self, monkeypatch):
+        """CSV workers plus download workers never exceed the pool size."""
+        monkeypatch.setenv("SFDUMP_CSV_WORKERS", "40")
+        assert orchestrator._background_csv_workers(32, 16) == 16
+
+    def test_keeps_configured_count_when_it_fits(self, monkeypatch):
+        """A small SFDUMP_CSV_WORKERS is used as-is."""
+        monkeypatch.setenv("SFDUMP_CSV_WORKERS", "6")
+        assert orchestrator._background_csv_workers(32, 16) == 6
+
+    def test_at_least_one_worker(self, monkeypatch):
+        """A pool already filled by downloads still leaves one CSV worker."""
+        monkeypatch.delenv("SFDUMP_CSV_WORKERS", raising=False)
+        assert orchestrator._background_csv_workers(8, 16) == 1
+
+
+class TestExportObjects:
+    """Tests for the Step 3 object export queue."""
+
+    def test_transient_error_is_requeued(self):
+        """A dropped connection is retried after the rest of the queue."""
+        calls = []
+        sleeps = []
+
+        def dump(name):
+            calls.append(name)
+            if name == "Account" and calls.count("Account") == 1:
+                raise ConnectionError("reset by peer")
+
+        exported, failed = orchestrator._export_objects(
+            dump, ("Account", "Contact"), sleep=sleeps.append, max_workers=1
+        )
+        assert (exported, failed) == (2, [])
+        assert calls == ["Account", "Contact", "Account"]
+        assert sleeps == [2]
+
+    def test_gives_up_after_max_attempts(self):
+        """Persistent transient errors fail the object after the attempt cap."""
+        calls = []
+
+        def dump(name):
+            calls.append(name)
+            raise TimeoutError("timed out")
+
+        exported, failed = orchestrator._export_objects(dump, ("Account",), sleep=lambda s: None)
+        assert (exported, failed) == (0, ["Account"])
+        assert len(calls) == orchestrator._MAX_OBJECT_ATTEMPTS
+
+    def test_permanent_error_not_retried(self):
+        """Non-network errors fail immediately and still report progress."""
+        done = []
+
+        def dump(name):
+            raise ValueError("INVALID_TYPE")
+
+        exported, failed = orchestrator._export_objects(
+            dump, ("Foo", "Bar"), on_done=done.append, sleep=lambda s: None
+        )
+        assert (exported, failed) == (0, ["Foo", "Bar"])
+        assert done == [1, 2]
+
+    def test_runs_objects_concurrently(self):
+        """Several objects are in flight at once when workers allow it."""
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def dump(name):
+            barrier.wait()  # Deadlocks (and times out) unless all three run together
+
+        exported, failed = orchestrator._export_objects(dump, ("A", "B", "C"), max_workers=3)
+        assert (exported, failed) == (3, [])
+
+    def test_stop_event_drops_queued_objects(self):
+        """Once stop is set, queued objects are not started."""
+        import threading
+
+        stop = threading.Event()
+        calls = []
+
+        def dump(name):
+            calls.append(name)
+            stop.set()
+
+        exported, failed = orchestrator._export_objects(
+            dump, ("A", "B", "C"), max_workers=1, stop=stop
+        )
+        assert calls == ["A"]
+        assert (exported, failed) == (1, [])
+
+    def test_rate_limit_propagates(self):
+        """RateLimitError stops the queue."""
+        from sfdump.exceptions import RateLimitError
+
+        def dump(name):
+            raise RateLimitError("limit")
+
+        with pytest.raises(RateLimitError):
+            orchestrator._export_objects(dump, ("Account",), sleep=lambda s: None)
+
+
+class TestGetApi:
+    """Tests for the cached SalesforceAPI client."""
+
+    def _fake_api_class(self, created):
+        class FakeAPI:
+            def __init__(self):
+                created.append(self)
+                self.calls = []
+
+            def connect(self):
+                self.calls.append("connect")
+
+            def limits(self):
+                self.calls.append("limits")
+                return {}
+
+        return FakeAPI
+
+    def setup_method(self):
+        orchestrator.invalidate_api()
+
+    def teardown_method(self):
+        orchestrator.invalidate_api()
+
+    def test_reuses_connected_client(self, monkeypatch):
+        """A second call returns the same client without reconnecting or probing it."""
+        import sfdump.api
+
+        created = []
+        monkeypatch.setattr(sfdump.api, "SalesforceAPI", self._fake_api_class(created))
+        assert orchestrator._get_api() is orchestrator._get_api()
+        assert len(created) == 1
+        assert created[0].calls == ["connect"]
+
+        orchestrator.invalidate_api()
+        orchestrator._get_api()
+        assert len(created) == 2
+
+    def test_reconnects_after_ttl(self, monkeypatch):
+        """A client from an earlier TTL bucket is replaced."""
+        import sfdump.api
+
+        created = []
+        monkeypatch.setattr(sfdump.api, "SalesforceAPI", self._fake_api_class(created))
+        monkeypatch.setenv("SFDUMP_API_CACHE_TTL", "10")
+        monkeypatch.setattr(orchestrator.time, "time", lambda: 5.0)
+        first = orchestrator._get_api()
+        monkeypatch.setattr(orchestrator.time, "time", lambda: 15.0)
+        assert orchestrator._get_api() is not first
+        assert len(created) == 2
+
+    def test_malformed_ttl_falls_back_to_default(self, monkeypatch):
+        """A bad SFDUMP_API_CACHE_TTL uses one hour instead of failing."""
+        monkeypatch.setenv("SFDUMP_API_CACHE_TTL", "1h")
+        assert orchestrator._api_cache_ttl() == 3600
+
+
+class TestIndexPathCounts:
+    """Tests for the streaming master index reconciliation."""
+
+    def test_counts_downloaded_and_missing(self, tmp_path):
+        """Rows with a non-blank local_path count as downloaded."""
+        index = tmp_path / "master_documents_index.csv"
+        index.write_text(
+            "file_id,local_path,file_name\n0691,files\\\\06\\\\a.pdf,a\n0692,,b\n0693,  ,c\n0694\n",
+            encoding="utf-8",
+        )
+        assert orchestrator._index_path_counts(index) == (1, 3)
+
+    def test_missing_file_or_column(self, tmp_path):
+        """A missing index counts nothing; a missing column counts all rows missing."""
+        assert orchestrator._index_path_counts(tmp_path / "nope.csv") == (0, 0)
+        index = tmp_path / "index.csv"
+        index.write_text("file_id\n0691\n0692\n", encoding="utf-8")
+        assert orchestrator._index_path_counts(index) == (0, 2)
+
+
+class TestBuildFileIndexes:
+    """Tests for the parallel Step 4 file-index build."""
+
+    def test_builds_all_and_ignores_object_errors(self):
+        """Every object is attempted; per-object failures are swallowed."""
+        seen = []
+
+        def build(name):
+            seen.append(name)
+            if name == "Opportunity":
+                raise ValueError("no files")
+
+        orchestrator._build_file_indexes(build, ("Account", "Opportunity", "Contact"))
+        assert sorted(seen) == ["Account", "Contact", "Opportunity"]
+
+    def test_rate_limit_propagates(self):
+        """RateLimitError stops the build."""
+        from sfdump.exceptions import RateLimitError
+
+        def build(name):
+            raise RateLimitError("limit")
+
+        with pytest.raises(RateLimitError):
+            orchestrator._build_file_indexes(build, ("Account",), max_workers=1)
+
+
+class TestProgressRelay:
+    """Tests for forwarding background progress to a late-attached bar."""
+
+    def test_attach_catches_up_and_forwards(self):
+        """Work done before attach is shown immediately; later work is forwarded."""
+        updates = []
+
+        class Bar:
+            def update(self, n):
+                updates.append(n)
+
+        relay = orchestrator._ProgressRelay()
+        relay(1)
+        relay(2)
+        relay.attach(Bar())
+        relay(3)
+        relay.detach()
+        relay(4)
+        assert updates == [2, 3]
+
+
+class TestPatchMasterIndex:
+    """Tests for applying retry recoveries to the master index."""
+
+    def test_recovered_index_paths(self):
+        """Only recovered rows are mapped, keyed the way the index keys them."""
+        att = [
+            {"Id": "00P1", "path": "files_legacy/a.pdf", "retry_status": "recovered"},
+            {"Id": "00P2", "path": "files_legacy/b.pdf", "retry_status": "not-found"},
+        ]
+        cv = [
+            {
+                "Id": "0681",
+                "ContentDocumentId": "0691",
+                "path": "06/c.pdf",
+                "retry_status": "recovered",
+            }
+        ]
+        assert orchestrator._recovered_index_paths(att, cv) == {
+            "00P1": "files_legacy/a.pdf",
+            "0691": "06/c.pdf",
+        }
+
+    def test_fills_blank_paths_only(self, tmp_path):
+        """Blank local_path cells are filled; existing paths are left alone."""
+        index = tmp_path / "master_documents_index.csv"
+        index.write_text(
+            "file_id,record_id,local_path\n"
+            "0691,006A,\n"
+            "0691,006B,\n"
+            "0692,006A,files/keep.pdf\n"
+            "0693,006A,\n",
+            encoding="utf-8",
+        )
+        updated = orchestrator._patch_master_index(
+            index, {"0691": "06/c.pdf", "0692": "06/other.pdf"}
+        )
+        assert updated == 2
+        assert index.read_text(encoding="utf-8").splitlines() == [
+            "file_id,record_id,local_path",
+            "0691,006A,files/06/c.pdf",
+            "0691,006B,files/06/c.pdf",
+            "0692,006A,files/keep.pdf",
+            "0693,006A,",
+        ]
+        assert not (tmp_path / "master_documents_index.csv.tmp").exists()
+
+
+class TestEnsureDatabase:
+    """Tests for ensure_database."""
+
+    def test_existing_database_is_reused(self, tmp_path, monkeypatch):
+        """An existing sfdata.db is returned without building."""
+        import sfdump.viewer.db_builder as db_builder
+
+        (tmp_path / "meta").mkdir()
+        db = tmp_path / "meta" / "sfdata.db"
+        db.write_text("db")
+        monkeypatch.setattr(
+            db_builder, "build_sqlite_from_export", lambda *a, **k: pytest.fail("rebuilt")
+        )
+        assert orchestrator.ensure_database(tmp_path) == db
+
+    def test_builds_when_missing(self, tmp_path, monkeypatch):
+        """A missing database is built (meta/ is left to the builder)."""
+        import sfdump.viewer.db_builder as db_builder
+
+        calls = []
+        monkeypatch.setattr(
+            db_builder, "build_sqlite_from_export", lambda src, dst: calls.append(dst)
+        )
+        db = orchestrator.ensure_database(tmp_path)
+        assert db == tmp_path / "meta" / "sfdata.db"
+        assert calls == [str(db)]
+
+
+class TestRunFullExportPipeline:
+    """Smoke test of run_full_export with every Salesforce-facing stage stubbed."""
+
+    def test_pipeline_completes_and_joins_database_build(self, tmp_path, monkeypatch):
+        """All steps run, the background CSV export and DB build are joined."""
+        import sfdump.command_docs_index as docs_index
+        import sfdump.command_files as command_files
+        import sfdump.dumper as dumper
+        import sfdump.files as files
+        import sfdump.viewer.db_builder as db_builder
+
+        monkeypatch.setattr(orchestrator, "_get_api", lambda: object())
+        monkeypatch.setattr(files, "dump_attachments", lambda api, out: {"count": 0})
+        monkeypatch.setattr(files, "dump_content_versions", lambda api, out: {"count": 0})
+
+        def dump_object(api, name, csv_dir):
+            if name == "Broken__c":
+                raise ValueError("INVALID_TYPE")
+            (Path(csv_dir) / f"{name}.csv").write_text("Id\n1\n", encoding="utf-8")
+
+        monkeypatch.setattr(dumper, "dump_object_to_csv", dump_object)
+        monkeypatch.setattr(orchestrator, "ESSENTIAL_OBJECTS", ("Account", "Broken__c"))
+        monkeypatch.setattr(command_files, "build_files_index", lambda api, obj, out: None)
+        monkeypatch.setattr(docs_index, "_build_master_index", lambda root: (None, 0, 0))
+
+        def build_db(export_dir, db_path, overwrite=False):
+            Path(db_path).write_text("db", encoding="utf-8")
+
+        monkeypatch.setattr(db_builder, "build_sqlite_from_export", build_db)
+
+        result = orchestrator.run_full_export(export_path=tmp_path / "export")
+
+        assert result.success
+        assert result.objects_exported == 1
+        assert result.objects_failed == ["Broken__c"]
+        assert result.database_path == (tmp_path / "export" / "meta" / "sfdata.db").resolve()
+        assert result.database_path.read_text(encoding="utf-8") == "db"
+
+    def test_database_build_finishes_before_recovery_writes(self, tmp_path, monkeypatch):
+        """Retry/merge must not start while the background build reads the CSVs."""
+        import threading
+        import time
+
+        import sfdump.command_docs_index as docs_index
+        import sfdump.command_files as command_files
+        import sfdump.dumper as dumper
+        import sfdump.files as files
+        import sfdump.retry as retry
+        import sfdump.verify as verify
+        import sfdump.viewer.db_builder as db_builder
+
+        build_done = threading.Event()
+        events = []
+
+        def dump_attachments(api, out):
+            links = Path(out) / "links"
+            links.mkdir(parents=True, exist_ok=True)
+            (links / "attachments.csv").write_text("Id,path\n00P1,\n", encoding="utf-8")
+            return {"count": 1}
+
+        def build_db(export_dir, db_path, overwrite=False):
+            time.sleep(0.2)
+            Path(db_path).write_text("db", encoding="utf-8")
+            build_done.set()
+
+        def retry_attachments(api, rows, export_root, links_dir):
+            events.append(("retry", build_done.is_set()))
+            return len(rows)
+
+        monkeypatch.setattr(orchestrator, "_get_api", lambda: object())
+        monkeypatch.setattr(files, "dump_attachments", dump_attachments)
+        monkeypatch.setattr(files, "dump_content_versions", lambda api, out: {"count": 0})
+        monkeypatch.setattr(
+            dumper,
+            "dump_object_to_csv",
+            lambda api, name, csv_dir: (Path(csv_dir) / f"{name}.csv").write_text("Id\n1\n"),
+        )
+        monkeypatch.setattr(orchestrator, "ESSENTIAL_OBJECTS", ("Account",))
+        monkeypatch.setattr(command_files, "build_files_index", lambda api, obj, out: None)
+        monkeypatch.setattr(docs_index, "_build_master_index", lambda root: (None, 0, 0))
+        monkeypatch.setattr(db_builder, "build_sqlite_from_export", build_db)
+        monkeypatch.setattr(
+            verify, "verify_attachments_rows", lambda meta, root: [{"Id": "00P1", "path": ""}]
+        )
+        monkeypatch.setattr(retry, "retry_missing_attachments", retry_attachments)
+
+        result = orchestrator.run_full_export(export_path=tmp_path / "export")
+
+        assert result.success
+        assert events == [("retry", True)]
+        # files_missing counts master-index rows, not unrecovered metadata rows
+        assert result.files_missing == 0
+
+    def test_small_recovery_patches_index_from_step_4(self, tmp_path, monkeypatch):
+        """Step 7 sizes the patch against Step 4's row count instead of re-reading the index."""
+        import sfdump.command_docs_index as docs_index
+        import sfdump.command_files as command_files
+        import sfdump.dumper as dumper
+        import sfdump.files as files
+        import sfdump.retry as retry
+        import sfdump.verify as verify
+        import sfdump.viewer.db_builder as db_builder
+
+        index_builds = []
+
+        def build_master_index(root):
+            index_builds.append(root)
+            index = Path(root) / "meta" / "master_documents_index.csv"
+            index.parent.mkdir(parents=True, exist_ok=True)
+            index.write_text(
+                "file_id,local_path\n00P1,\n00P2,files/b\n00P3,files/c\n00P4,files/d\n",
+                encoding="utf-8",
+            )
+            return index, 3, 1
+
+        def dump_attachments(api, out):
+            links = Path(out) / "links"
+            links.mkdir(parents=True, exist_ok=True)
+            (links / "attachments.csv").write_text("Id,path\n00P1,\n", encoding="utf-8")
+            return {"count": 1}
+
+        def retry_attachments(api, rows, export_root, links_dir):
+            for r in rows:
+                r.update(retry_status="recovered", path="files/a")
+            return 0
+
+        calls = []
+        count_index = orchestrator._index_path_counts
+        patch_index = orchestrator._patch_master_index
+
+        def counting(index_path):
+            calls.append("count")
+            return count_index(index_path)
+
+        def patching(index_path, updates):
+            calls.append("patch")
+            return patch_index(index_path, updates)
+
+        monkeypatch.setattr(orchestrator, "_get_api", lambda: object())
+        monkeypatch.setattr(files, "dump_attachments", dump_attachments)
+        monkeypatch.setattr(files, "dump_content_versions", lambda api, out: {"count": 0})
+        monkeypatch.setattr(
+            dumper,
+            "dump_object_to_csv",
+            lambda api, name, csv_dir: (Path(csv_dir) / f"{name}.csv").write_text("Id\n1\n"),
+        )
+        monkeypatch.setattr(orchestrator, "ESSENTIAL_OBJECTS", ("Account",))
+        monkeypatch.setattr(command_files, "build_files_index", lambda api, obj, out: None)
+        monkeypatch.setattr(docs_index, "_build_master_index", build_master_index)
+        monkeypatch.setattr(
+            db_builder,
+            "build_sqlite_from_export",
+            lambda export_dir, db_path, overwrite=False: Path(db_path).write_text("db"),
+        )
+        monkeypatch.setattr(
+            verify, "verify_attachments_rows", lambda meta, root: [{"Id": "00P1", "path": ""}]
+        )
+        monkeypatch.setattr(retry, "retry_missing_attachments", retry_attachments)
+        monkeypatch.setattr(orchestrator, "_index_path_counts", counting)
+        monkeypatch.setattr(orchestrator, "_patch_master_index", patching)
+
+        export = tmp_path / "export"
+        assert orchestrator.run_full_export(export_path=export).success
+
+        assert len(index_builds) == 1
+        assert calls[0] == "patch"  # Only the final summary counts the index
+        index = (export / "meta" / "master_documents_index.csv").read_text(encoding="utf-8")
+        assert index.splitlines()[1] == "00P1,files/a"
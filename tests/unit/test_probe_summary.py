@@ -0,0 +1,101 @@
+"""Tests for sfdump.probe_summary module."""
+
+import json
+
+from sfdump.probe_summary import build_probe_summary
+
+
+def _check(summary, name):
+    return next(c for c in summary["checks"] if c["name"] == name)
+
+
+class TestBuildProbeSummary:
+    """Tests for build_probe_summary."""
+
+    def test_counts_accept_ints_and_numeric_strings(self):
+        """Integer and numeric-string counts are both read as numbers."""
+        summary = build_probe_summary(
+            {"counts": {"ContentVersion_latest": 5, "ContentDocumentLink_seeded": "12"}}
+        )
+        assert _check(summary, "Files discovered")["status"] == "PASS"
+        assert _check(summary, "File links discovered")["detail"] == (
+            "ContentDocumentLink_seeded=12"
+        )
+
+    def test_unparseable_counts_read_as_zero(self):
+        """Missing, None and non-numeric counts all count as zero."""
+        summary = build_probe_summary(
+            {"counts": {"ContentVersion_latest": None, "EmailMessage": "n/a"}}
+        )
+        assert _check(summary, "Files discovered")["status"] == "FAIL"
+        assert _check(summary, "Emails discovered")["detail"] == "EmailMessage=0"
+        assert _check(summary, "No missing latest versions")["status"] == "PASS"
+        assert summary["overall"] == "FAIL"
+
+        # Strings that look numeric to str.isdigit() but that int() rejects
+        for bad in ("--5", "²", "-²"):
+            summary = build_probe_summary(
+                {"counts": {"ContentVersion_latest": bad, "EmailMessage": bad}}
+            )
+            assert _check(summary, "Files discovered")["status"] == "FAIL"
+            assert _check(summary, "Emails discovered")["detail"] == "EmailMessage=0"
+
+        # json.loads accepts Infinity and NaN; int() rejects them
+        counts = json.loads('{"ContentVersion_latest": Infinity, "EmailMessage": NaN}')
+        summary = build_probe_summary({"counts": counts})
+        assert _check(summary, "Files discovered")["status"] == "FAIL"
+        assert _check(summary, "Emails discovered")["detail"] == "EmailMessage=0"
+
+
+class TestWriteProbeSummary:
+    """Tests for write_probe_summary."""
+
+    def test_writes_json_and_markdown(self, tmp_path):
+        """Both files are written; Markdown has checks, benign notes and errors."""
+        import json
+
+        from sfdump.probe_summary import write_probe_summary
+
+        report = {
+            "generated_utc": "2025-01-01T00:00:00Z",
+            "counts": {"ContentVersion_latest": 1},
+            "errors": {"CombinedAttachment": "INVALID_TYPE"},
+        }
+        summary = write_probe_summary(tmp_path, report)
+
+        assert json.loads((tmp_path / "probe_summary.json").read_text(encoding="utf-8")) == summary
+        md = (tmp_path / "probe_summary.md").read_text(encoding="utf-8")
+        assert md.startswith(
+            "# Probe Summary: FAIL\n\n"
+            "- Generated (UTC): `2025-01-01T00:00:00Z`\n\n"
+            "## Checks\n\n"
+            "| Check | Status | Detail |\n"
+            "|---|---|---|\n"
+            "| Files discovered | **PASS** | ContentVersion_latest=1 |\n"
+        )
+        assert "\n\n## Benign warnings\n\n- CombinedAttachment query failed" in md
+        assert md.endswith(
+            '\n\n## Errors (raw)\n\n```json\n{\n  "CombinedAttachment": "INVALID_TYPE"\n}\n```\n'
+        )
+
+    def test_json_falls_back_without_orjson(self, tmp_path, monkeypatch):
+        """The stdlib encoder is used when orjson isn't importable."""
+        import builtins
+        import json
+
+        from sfdump.probe_summary import _write_json
+
+        real_import = builtins.__import__
+
+        def no_orjson(name, *args, **kwargs):
+            if name == "orjson":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", no_orjson)
+        out = tmp_path / "out.json"
+        _write_json(out, {"name": "Café", "n": 1})
+
+        assert out.read_text(encoding="utf-8") == json.dumps(
+            {"name": "Café", "n": 1}, indent=2, ensure_ascii=False
+        )
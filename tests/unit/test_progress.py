@@ -14,6 +14,7 @@ import io
 import time
 
 from sfdump.progress import (
+    CHECKMARK,
     ProgressBar,
     ProgressReporter,
     Spinner,
@@ -47,8 +48,48 @@ class TestProgressBar:
 
         assert "0%" in result
 
-    def test_progress_bar_update_is_thread_safe(self):
-        """Update should be thread-safe via lock."""
+    def test_default_width_matches_uncached_render(self):
+        """Cached default-width bars match the arithmetic rendering at every fill."""
+        from sfdump.progress import BAR_EMPTY, BAR_FILLED
+
+        pb = ProgressBar(total=20, indent="", output=io.StringIO())
+        for filled in range(21):
+            pb._current = filled
+            expected = BAR_FILLED * filled + BAR_EMPTY * (20 - filled)
+            assert f"[{expected}]" in pb._render_bar(0)
+
+    def test_custom_width_matches_uncached_render(self):
+        """Per-instance bar segments for non-default widths render correctly."""
+        from sfdump.progress import BAR_EMPTY, BAR_FILLED
+
+        pb = ProgressBar(label="Sync", total=7, width=7, indent="  ", output=io.StringIO())
+        for filled in range(8):
+            pb._current = filled
+            expected = BAR_FILLED * filled + BAR_EMPTY * (7 - filled)
+            assert pb._render_bar(0).startswith("  Sync ")
+            assert f"[{expected}]" in pb._render_bar(0)
+
+    def test_bars_of_same_width_share_one_table(self):
+        """Bar segments are built once per width, not once per bar."""
+        a = ProgressBar(total=5, width=7, output=io.StringIO())
+        b = ProgressBar(total=9, width=7, output=io.StringIO())
+        default = ProgressBar(total=5, output=io.StringIO())
+
+        from sfdump.progress import _BAR_CACHE
+
+        assert a._bars is b._bars
+        assert default._bars is _BAR_CACHE
+
+    def test_overfull_bar_is_clamped(self):
+        """Progress beyond total never draws past the bar width."""
+        from sfdump.progress import BAR_FILLED
+
+        pb = ProgressBar(total=10, indent="", output=io.StringIO())
+        pb._current = 15
+        assert "[" + BAR_FILLED * 20 + "]" in pb._render_bar(0)
+
+    def test_progress_bar_update_sets_current(self):
+        """Update should store the new progress value."""
         output = io.StringIO()
         pb = ProgressBar(total=100, output=output)
         pb.update(75)
@@ -82,6 +123,138 @@ class TestProgressBar:
         assert "✓" in result
 
 
+class TestRedrawThrottling:
+    """Tests for skipping redundant animation frames."""
+
+    def test_bar_redraws_only_on_progress_when_not_a_tty(self):
+        """Off a terminal, idle ticks write nothing; a progress change writes once."""
+        output = io.StringIO()
+        pb = ProgressBar(total=10, width=10, indent="", output=output)
+
+        with pb:
+            time.sleep(0.35)  # Several idle ticks
+            frames_idle = output.getvalue().count("\r")
+            pb.update(5)
+            time.sleep(0.25)
+            frames_after = output.getvalue().count("\r")
+
+        assert frames_idle == 1
+        assert frames_after == 2
+
+    def test_bar_animates_on_a_tty(self):
+        """On a terminal the spinner glyph keeps redrawing."""
+
+        class TTY(io.StringIO):
+            def isatty(self):
+                return True
+
+        output = TTY()
+        with ProgressBar(total=10, width=10, indent="", output=output):
+            time.sleep(0.35)
+        assert output.getvalue().count("\r") >= 3
+
+    def test_spinner_writes_once_when_not_a_tty(self):
+        """Off a terminal the spinner writes a single frame plus the final line."""
+        output = io.StringIO()
+        with Spinner(message="Loading", indent="", output=output):
+            time.sleep(0.35)
+        assert output.getvalue().count("\r") == 2
+
+
+class TestAdaptiveFrameRate:
+    """Tests for slowing the animation while nothing changes."""
+
+    def test_frame_interval_backs_off_with_idle_time(self):
+        """Busy widgets draw at 10 fps; idle ones slow to 3 fps, then 1 fps."""
+        from sfdump.progress import _frame_interval
+
+        assert _frame_interval(0.5) == 0.1
+        assert _frame_interval(5) == 0.3
+        assert _frame_interval(60) == 1.0
+
+    def test_idle_bar_draws_less_often_until_updated(self):
+        """A long-idle bar skips frames, but an update is drawn on the next tick."""
+
+        class TTY(io.StringIO):
+            def isatty(self):
+                return True
+
+        output = TTY()
+        pb = ProgressBar(total=10, indent="", output=output)
+        pb._last_change = time.monotonic() - 60  # Idle for a minute
+        with pb:
+            time.sleep(0.35)
+            frames_idle = output.getvalue().count("\r")
+            pb.update(3)
+            time.sleep(0.15)
+            drawn = output.getvalue()
+
+        assert frames_idle == 1
+        # Back at full speed once progress moves again
+        assert drawn.count("\r") >= 2
+        assert " 30%" in drawn
+
+
+class TestSpinnerWrites:
+    """Tests for how many flushes a spinner lifecycle costs."""
+
+    def test_quick_spinner_flushes_once_per_write_batch(self):
+        """The leading newline rides along with the first frame's flush."""
+
+        class Counting(io.StringIO):
+            flushes = 0
+
+            def flush(self):
+                Counting.flushes += 1
+                super().flush()
+
+        output = Counting()
+        with Spinner(message="Quick", indent="", output=output):
+            pass
+
+        assert output.getvalue().startswith("\n\r")
+        assert output.getvalue().endswith(f"\r{CHECKMARK} Quick\n")
+        assert Counting.flushes == 2  # First frame, final line
+
+
+class TestSharedTicker:
+    """Tests for the single animation thread shared by all widgets."""
+
+    def test_sequential_bars_share_one_thread(self):
+        """Entering many bars does not start a thread per bar."""
+        import threading
+
+        from sfdump.progress import _ticker
+
+        for _ in range(5):
+            with ProgressBar(total=1, output=io.StringIO()) as pb:
+                pb.update(1)
+        thread = _ticker._thread
+        for _ in range(5):
+            with Spinner(message="x", output=io.StringIO()):
+                pass
+
+        assert _ticker._thread is thread
+        names = [t.name for t in threading.enumerate()]
+        assert names.count("sfdump-progress") == 1
+
+    def test_no_frames_after_exit(self):
+        """Once a bar has exited, the ticker never writes to its output again."""
+
+        class TTY(io.StringIO):
+            def isatty(self):
+                return True
+
+        output = TTY()
+        with ProgressBar(total=10, indent="", output=output):
+            time.sleep(0.15)
+        final = output.getvalue()
+        time.sleep(0.25)
+
+        assert final.endswith("\n")
+        assert output.getvalue() == final
+
+
 class TestSpinner:
     """Tests for the Spinner class."""
 
@@ -404,3 +577,84 @@ class TestProgressReporter:
 
         result = output.getvalue()
         assert "Run 'sf view' to browse" in result
+
+
+class TestReporterBuffering:
+    """Tests for ProgressReporter's coalesced flushing."""
+
+    class _CountingIO(io.StringIO):
+        def __init__(self, tty=False):
+            super().__init__()
+            self.flushes = 0
+            self.tty = tty
+
+        def isatty(self):
+            return self.tty
+
+        def flush(self):
+            self.flushes += 1
+            super().flush()
+
+    def test_plain_lines_do_not_flush(self):
+        """info/substep/summary lines stay buffered until a boundary."""
+        output = self._CountingIO()
+        reporter = ProgressReporter(output=output)
+
+        reporter.info("a")
+        reporter.substep("b")
+        reporter.summary_item("Files:", "3")
+
+        assert output.flushes == 0
+        reporter.flush()
+        assert output.flushes == 1
+
+    def test_step_boundaries_flush(self):
+        """On a terminal, step_start and step_done flush so the user sees progress."""
+        output = self._CountingIO(tty=True)
+        reporter = ProgressReporter(output=output)
+
+        reporter.step_start(1, 3, "Working")
+        assert output.flushes == 1
+        reporter.step_done()
+        assert output.flushes == 2
+        assert output.getvalue() == "[1/3] Working... done\n"
+
+    def test_partial_lines_not_flushed_off_a_terminal(self):
+        """Redirected output only flushes once the step line is complete."""
+        output = self._CountingIO()
+        reporter = ProgressReporter(output=output)
+
+        reporter.step_start(1, 3, "Working")
+        assert output.flushes == 0
+        reporter.step_done()
+        assert output.flushes == 1
+        assert output.getvalue() == "[1/3] Working... done\n"
+
+
+class TestSupportsUnicode:
+    """Tests for stdout Unicode detection."""
+
+    def _stdout(self, encoding):
+        import types
+
+        return types.SimpleNamespace(encoding=encoding)
+
+    def test_utf_encodings_are_supported(self, monkeypatch):
+        """UTF codecs are recognised however their names are spelled."""
+        import sys
+
+        from sfdump.progress import _supports_unicode
+
+        for encoding in ("UTF-8", "utf_8", "utf8", "utf-16-le", "cp65001"):
+            monkeypatch.setattr(sys, "stdout", self._stdout(encoding))
+            assert _supports_unicode(), encoding
+
+    def test_legacy_or_missing_encodings_fall_back(self, monkeypatch):
+        """Legacy code pages, unknown codecs and missing encodings use ASCII."""
+        import sys
+
+        from sfdump.progress import _supports_unicode
+
+        for encoding in ("cp1252", "ascii", "no-such-codec", None):
+            monkeypatch.setattr(sys, "stdout", self._stdout(encoding))
+            assert not _supports_unicode(), encoding
@@ -5,11 +5,14 @@ from pathlib import Path
 import pytest
 
 from sfdump.report import (
+    _add_attachment_pseudonym,
+    _count_csv,
+    _iter_markdown_table,
     _load_csv,
-    _make_redaction_maps,
     _markdown_header,
     _markdown_section,
     _markdown_table,
+    _parent_redaction_map,
     generate_missing_report,
 )
 
@@ -60,6 +63,30 @@ class TestMarkdownTable:
         assert "| --- | --- |" in result
 
 
+class TestIterMarkdownTable:
+    """Tests for _iter_markdown_table function."""
+
+    def test_yields_same_lines_as_markdown_table(self):
+        """Streamed lines join to the same text as _markdown_table."""
+        headers = ["Col1", "Col2"]
+        rows = [["a", "b"], ["c", "d"]]
+
+        lines = list(_iter_markdown_table(headers, iter(rows)))
+
+        assert lines[0] == "| Col1 | Col2 |\n"
+        assert all(line.endswith("\n") for line in lines)
+        assert "".join(lines) == _markdown_table(headers, rows)
+
+    def test_accepts_tuple_rows(self):
+        """Tuple rows render the same as list rows."""
+        headers = ["A", "B", "C"]
+
+        lines = list(_iter_markdown_table(headers, [("x", "y", "z")]))
+
+        assert lines[2] == "| x | y | z |\n"
+        assert lines == list(_iter_markdown_table(headers, [["x", "y", "z"]]))
+
+
 class TestLoadCsv:
     """Tests for _load_csv function."""
 
@@ -80,47 +107,80 @@ class TestLoadCsv:
         assert result == []
 
 
-class TestMakeRedactionMaps:
-    """Tests for _make_redaction_maps function."""
+class TestCountCsv:
+    """Tests for _count_csv function."""
 
-    def test_creates_attachment_map(self):
-        """Creates attachment ID to pseudonym map."""
-        retry_rows = [
-            {"Id": "ATT001"},
-            {"Id": "ATT002"},
-        ]
-        analysis = []
+    def test_counts_data_rows(self, tmp_path):
+        """Counts rows after the header, including quoted multi-line fields."""
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text('id,name\n1,Alice\n2,"Bob\nSmith"\n\n3,Carol\n')
 
-        att_map, parent_map = _make_redaction_maps(retry_rows, analysis)
+        assert _count_csv(str(csv_file)) == 3
 
-        assert att_map["ATT001"] == "ATTACHMENT_1"
-        assert att_map["ATT002"] == "ATTACHMENT_2"
+    def test_returns_zero_for_nonexistent_empty_or_header_only(self, tmp_path):
+        """Missing, empty and header-only files count as no rows."""
+        empty = tmp_path / "empty.csv"
+        empty.write_text("")
+        header_only = tmp_path / "header.csv"
+        header_only.write_text("id,name\n")
+
+        assert _count_csv(str(tmp_path / "nonexistent.csv")) == 0
+        assert _count_csv(str(empty)) == 0
+        assert _count_csv(str(header_only)) == 0
+
+
+def _attachment_map(retry_rows):
+    att_map = {}
+    for idx, r in enumerate(retry_rows, start=1):
+        _add_attachment_pseudonym(att_map, idx, r.get("Id"))
+    return att_map
+
+
+class TestAddAttachmentPseudonym:
+    """Tests for _add_attachment_pseudonym function."""
+
+    def test_numbers_attachments_by_row(self):
+        """Assigns ATTACHMENT_<row> pseudonyms."""
+        att_map = _attachment_map([{"Id": "ATT001"}, {"Id": "ATT002"}])
+
+        assert att_map == {"ATT001": "ATTACHMENT_1", "ATT002": "ATTACHMENT_2"}
+
+    def test_first_row_wins_and_blanks_get_placeholders(self):
+        """A repeated Id keeps its first number; a row without an Id gets ATT-<row>."""
+        att_map = _attachment_map([{"Id": "ATT001"}, {"Id": "ATT001"}, {}, {"Id": "ATT002"}])
+
+        assert att_map == {
+            "ATT001": "ATTACHMENT_1",
+            "ATT-3": "ATTACHMENT_3",
+            "ATT002": "ATTACHMENT_4",
+        }
+
+
+class TestParentRedactionMap:
+    """Tests for _parent_redaction_map function."""
 
     def test_creates_parent_map(self):
         """Creates parent ID to pseudonym map."""
-        retry_rows = []
-        analysis = [
-            {"ParentId": "001ABC"},
-            {"ParentId": "006XYZ"},
-        ]
-
-        att_map, parent_map = _make_redaction_maps(retry_rows, analysis)
+        analysis = [{"ParentId": "001ABC"}, {"ParentId": "006XYZ"}]
 
-        assert parent_map["001ABC"] == "PARENT_1"
-        assert parent_map["006XYZ"] == "PARENT_2"
+        assert _parent_redaction_map(analysis) == {"001ABC": "PARENT_1", "006XYZ": "PARENT_2"}
 
-    def test_deduplicates_ids(self):
-        """Does not duplicate IDs in maps."""
-        retry_rows = [
-            {"Id": "ATT001"},
-            {"Id": "ATT001"},  # duplicate
+    def test_numbering_skips_duplicates_and_blanks(self):
+        """Parents are numbered by distinct Id, in first-seen order."""
+        analysis = [
+            {"ParentId": "001A"},
+            {"ParentId": "001B"},
+            {"ParentId": "001A"},
+            {"ParentId": ""},
+            {},
+            {"ParentId": "001C"},
         ]
-        analysis = []
 
-        att_map, parent_map = _make_redaction_maps(retry_rows, analysis)
-
-        # Should only have one entry
-        assert len([k for k in att_map if k.startswith("ATT")]) == 1
+        assert _parent_redaction_map(analysis) == {
+            "001A": "PARENT_1",
+            "001B": "PARENT_2",
+            "001C": "PARENT_3",
+        }
 
 
 class TestGenerateMissingReport:
@@ -192,6 +252,47 @@ class TestGenerateMissingReport:
         assert "Diagnostic Evidence" in content
         assert "forbidden" in content
 
+    def test_retry_counts_and_affected_ids(self, export_structure):
+        """Recovered/failed counts and the affected Id list come from the retry CSV."""
+        links_dir = export_structure / "links"
+        (links_dir / "attachments_missing_retry.csv").write_text(
+            "Id,retry_success\nATT001,true\nATT002,false\nATT003,false\nATT004,\n"
+        )
+
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report"
+        )
+
+        content = Path(md_path).read_text()
+        assert "Files recovered on retry: **1**" in content
+        assert "Files still failing after retry: **2**" in content
+        assert "ATT001, ATT002, ATT003, ATT004\n" in content
+
+    def test_affected_ids_are_deduplicated(self, export_structure):
+        """Repeated retry attempts list each Id once; blank Ids are dropped."""
+        links_dir = export_structure / "links"
+        (links_dir / "attachments_missing_retry.csv").write_text(
+            "Id,retry_success\nATT002,false\nATT001,false\nATT002,false\n,false\n"
+        )
+
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report"
+        )
+
+        content = Path(md_path).read_text()
+        assert "Affected Attachment Ids:\n\nATT002, ATT001\n" in content
+        assert "Files still failing after retry: **4**" in content
+
+    def test_affected_ids_omitted_without_retry_rows(self, export_structure):
+        """No retry data means no empty Affected Attachment Ids paragraph."""
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report"
+        )
+
+        content = Path(md_path).read_text()
+        assert "Recommended Message to Salesforce Support" in content
+        assert "Affected Attachment Ids" not in content
+
     def test_report_with_redaction(self, export_structure):
         """Report redacts sensitive data when requested."""
         links_dir = export_structure / "links"
@@ -212,6 +313,20 @@ class TestGenerateMissingReport:
         assert "sensitive_doc.pdf" not in content
         assert "ATTACHMENT_1" in content
 
+    def test_redacted_ids_numbered_by_first_retry_row(self, export_structure):
+        """Repeated retry rows keep the pseudonym of the first row for that Id."""
+        links_dir = export_structure / "links"
+        (links_dir / "attachments_missing_retry.csv").write_text(
+            "Id,retry_success\nATT001,false\nATT001,false\nATT002,false\n"
+        )
+
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report", redact=True
+        )
+
+        content = Path(md_path).read_text()
+        assert "Affected Attachment Ids:\n\nATTACHMENT_1, ATTACHMENT_3\n" in content
+
     def test_report_with_analysis_data(self, export_structure):
         """Report includes impact analysis."""
         links_dir = export_structure / "links"
@@ -235,6 +350,48 @@ class TestGenerateMissingReport:
         assert "missing_file_report-" in md_path
         assert Path(md_path).exists()
 
+    def test_timestamps_are_consistent(self, export_structure):
+        """File name and both report timestamps come from the same instant."""
+        import re
+
+        md_path, _ = generate_missing_report(str(export_structure), pdf=False)
+
+        content = Path(md_path).read_text()
+        generated = re.search(r"Report generated: \*\*(\S+) UTC\*\*", content).group(1)
+        assert f"Report timestamp (UTC): `{generated}`" in content
+        stamp = generated[:19].replace("-", "").replace(":", "").replace("T", "-")
+        assert f"missing_file_report-{stamp}.md" in md_path
+
+    def test_default_logo_is_first_image_by_name(self, export_structure, monkeypatch):
+        """Without logo_path, the alphabetically first image under src/logos is used."""
+        logos = export_structure / "src" / "logos"
+        logos.mkdir(parents=True)
+        for name in ("notes.txt", "zeta.png", "Beta.SVG", "alpha.jpg"):
+            (logos / name).write_text("x")
+        monkeypatch.chdir(export_structure)
+
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report"
+        )
+
+        content = Path(md_path).read_text()
+        assert content.startswith("![Logo](../src/logos/Beta.SVG)")
+
+    def test_summary_by_parent_object_totals(self, export_structure):
+        """Missing counts are summed per object; blank types and junk counts are tolerated."""
+        links_dir = export_structure / "links"
+        (links_dir / "missing_file_analysis.csv").write_text(
+            "ParentId,ParentObject,MissingCount\n"
+            "001A,Account,2\n001B,Account,3\n006A,Opportunity,x\n999,,4\n"
+        )
+
+        md_path, _ = generate_missing_report(
+            str(export_structure), pdf=False, out_basename="test_report"
+        )
+
+        content = Path(md_path).read_text()
+        assert "| Account | 5 |\n| Opportunity | 0 |\n| Unknown | 4 |\n" in content
+
     def test_percentage_calculation(self, export_structure):
         """Calculates percentages correctly."""
         links_dir = export_structure / "links"
@@ -260,6 +417,26 @@ class TestGenerateMissingReport:
         assert "Export Context" in content
         assert "Export directory" in content
 
+    def test_pdf_converted_from_written_markdown(self, export_structure, monkeypatch):
+        """PDF conversion reads the Markdown file rather than an in-memory copy."""
+        import sys
+        import types
+
+        calls = []
+        fake = types.SimpleNamespace(
+            convert_file=lambda src, **kw: calls.append((src, Path(src).read_text(), kw))
+        )
+        monkeypatch.setitem(sys.modules, "pypandoc", fake)
+
+        md_path, pdf_path = generate_missing_report(
+            str(export_structure), pdf=True, out_basename="test_report"
+        )
+
+        assert pdf_path == md_path[:-3] + ".pdf"
+        assert calls[0][0] == md_path
+        assert "Executive Summary" in calls[0][1]
+        assert calls[0][2]["outputfile"] == pdf_path
+
     def test_pdf_generation_skipped_without_pypandoc(self, export_structure):
         """PDF generation is skipped if pypandoc import fails."""
         # Just test that PDF generation doesn't crash when pypandoc isn't available
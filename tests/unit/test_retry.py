@@ -3,7 +3,14 @@
 import csv
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from sfdump.exceptions import RateLimitError
 from sfdump.retry import (
+    _attempt_download,
+    _classify,
+    _download_windowed,
+    _split_paths,
     _write_retry_results,
     load_missing_csv,
     merge_recovered_into_metadata,
@@ -12,6 +19,39 @@ from sfdump.retry import (
 )
 
 
+class TestClassify:
+    """Tests for _classify function."""
+
+    @pytest.mark.parametrize(
+        "err,expected",
+        [
+            ("403 Client Error: Forbidden", "forbidden"),
+            ("404 Client Error: Not Found", "not-found"),
+            ("Connection aborted", "connection-error"),
+            ("RemoteDisconnected('closed')", "connection-error"),
+            ("something else", "unknown"),
+        ],
+    )
+    def test_maps_error_to_status(self, err, expected):
+        """Maps known error substrings to retry statuses."""
+        assert _classify(err) == expected
+
+    def test_first_pattern_wins(self):
+        """Earlier patterns take precedence when several match."""
+        assert _classify("403 after Connection reset") == "forbidden"
+
+
+class TestSplitPaths:
+    """Tests for _split_paths function."""
+
+    def test_returns_path_and_directory(self, tmp_path):
+        """Joins under the export root and returns the parent directory."""
+        out_path, out_dir = _split_paths(str(tmp_path), "files/ab/doc.pdf")
+
+        assert out_path == str(tmp_path / "files" / "ab" / "doc.pdf")
+        assert out_dir == str(tmp_path / "files" / "ab")
+
+
 class TestLoadMissingCsv:
     """Tests for load_missing_csv function."""
 
@@ -62,6 +102,109 @@ class TestWriteRetryResults:
         assert "ATT002,forbidden" in content
 
 
+@patch("sfdump.retry.time.sleep")
+class TestAttemptDownload:
+    """Tests for _attempt_download function."""
+
+    def test_success_first_try(self, sleep):
+        """Returns the download result without sleeping."""
+        api = MagicMock()
+        api.download_path_to_file.return_value = 42
+
+        assert _attempt_download(api, "/url", "out") == 42
+        sleep.assert_not_called()
+
+    def test_retries_transient_errors_with_backoff(self, sleep):
+        """Connection errors and 5xx are retried with growing delays."""
+        api = MagicMock()
+        api.download_path_to_file.side_effect = [
+            Exception("Connection aborted"),
+            Exception("503 Server Error: Service Unavailable"),
+            7,
+        ]
+
+        assert _attempt_download(api, "/url", "out", max_attempts=4, base=0.5) == 7
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert len(delays) == 2
+        assert 0.5 <= delays[0] <= 1.0
+        assert 1.0 <= delays[1] <= 1.5
+
+    def test_gives_up_after_max_attempts(self, sleep):
+        """The last transient error is raised once attempts run out."""
+        api = MagicMock()
+        api.download_path_to_file.side_effect = Exception("Connection refused")
+
+        with pytest.raises(Exception, match="Connection refused"):
+            _attempt_download(api, "/url", "out", max_attempts=3)
+        assert api.download_path_to_file.call_count == 3
+        assert sleep.call_count == 2
+
+    def test_non_transient_error_not_retried(self, sleep):
+        """404 and similar errors are raised immediately."""
+        api = MagicMock()
+        api.download_path_to_file.side_effect = Exception("404 Not Found")
+
+        with pytest.raises(Exception, match="404"):
+            _attempt_download(api, "/url", "out")
+        assert api.download_path_to_file.call_count == 1
+        sleep.assert_not_called()
+
+    def test_rate_limit_not_retried(self, sleep):
+        """RateLimitError propagates immediately."""
+        api = MagicMock()
+        api.download_path_to_file.side_effect = RateLimitError("limit")
+
+        with pytest.raises(RateLimitError):
+            _attempt_download(api, "/url", "out")
+        assert api.download_path_to_file.call_count == 1
+
+
+class TestDownloadWindowed:
+    """Tests for _download_windowed helper."""
+
+    def test_bounds_in_flight_downloads_and_yields_all(self):
+        """Never more than `window` downloads are submitted but not yet consumed."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        lock = threading.Lock()
+        state = {"submitted": 0, "consumed": 0, "peak": 0}
+
+        class Api:
+            def download_path_to_file(self, rel_url, out_path):
+                return out_path
+
+        api = Api()
+        real_submit = ThreadPoolExecutor.submit
+
+        def counting_submit(executor, fn, *args):
+            with lock:
+                state["submitted"] += 1
+                in_flight = state["submitted"] - state["consumed"]
+                state["peak"] = max(state["peak"], in_flight)
+            return real_submit(executor, fn, *args)
+
+        to_download = [({"Id": str(i)}, f"/url/{i}", f"out/{i}") for i in range(50)]
+        seen = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with patch.object(ThreadPoolExecutor, "submit", counting_submit):
+                for fut, r in _download_windowed(executor, api, to_download, window=3):
+                    assert fut.result() == f"out/{r['Id']}"
+                    seen.append(r["Id"])
+                    with lock:
+                        state["consumed"] += 1
+
+        assert sorted(seen, key=int) == [str(i) for i in range(50)]
+        assert state["peak"] <= 3
+
+    def test_empty_input_yields_nothing(self):
+        """No downloads means nothing is submitted or yielded."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert list(_download_windowed(executor, MagicMock(), [], window=4)) == []
+
+
 class TestRetryMissingAttachments:
     """Tests for retry_missing_attachments function."""
 
@@ -72,12 +215,33 @@ class TestRetryMissingAttachments:
         links_dir.mkdir()
 
         # Should not raise an exception
-        retry_missing_attachments(mock_api, [], str(tmp_path), str(links_dir))
+        assert retry_missing_attachments(mock_api, [], str(tmp_path), str(links_dir)) == 0
 
         # No retry CSV should be created for empty input
         retry_csv = links_dir / "attachments_missing_retry.csv"
         assert not retry_csv.exists()
 
+    def test_empty_generator_writes_nothing(self, tmp_path):
+        """An exhausted iterable is treated like an empty list."""
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+
+        rows = (r for r in [])
+        assert retry_missing_attachments(MagicMock(), rows, str(tmp_path), str(links_dir)) == 0
+        assert not (links_dir / "attachments_missing_retry.csv").exists()
+
+    @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
+    def test_accepts_generator_rows(self, tmp_path):
+        """Rows may arrive as a one-shot generator; the first row is not lost."""
+        mock_api = MagicMock()
+        mock_api.api_version = "v58.0"
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+
+        rows = (dict(Id=f"ATT00{i}", path=f"files/{i}.pdf") for i in range(2))
+        assert retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir)) == 0
+        assert mock_api.download_path_to_file.call_count == 2
+
     @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)  # Disable tqdm
     def test_successful_retry(self, tmp_path):
         """Successfully retries and recovers file."""
@@ -92,8 +256,9 @@ class TestRetryMissingAttachments:
 
         rows = [{"Id": "ATT001", "path": "files/doc.pdf"}]
 
-        retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
+        still_missing = retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
 
+        assert still_missing == 0
         # Check retry CSV was created
         retry_csv = links_dir / "attachments_missing_retry.csv"
         assert retry_csv.exists()
@@ -104,6 +269,71 @@ class TestRetryMissingAttachments:
             results = list(reader)
         assert len(results) == 1
         assert results[0]["retry_status"] == "recovered"
+        call_args = mock_api.download_path_to_file.call_args
+        assert call_args[0][0] == "/services/data/v58.0/sobjects/Attachment/ATT001/Body"
+
+    @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
+    def test_creates_each_output_directory_once(self, tmp_path):
+        """Output directories are created once each, before downloading."""
+        import os
+
+        mock_api = MagicMock()
+        mock_api.api_version = "v58.0"
+        (tmp_path / "files").mkdir()  # makedirs recurses through os for missing parents
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+
+        rows = [
+            {"Id": "ATT001", "path": "files/aa/one.pdf"},
+            {"Id": "ATT002", "path": "files/aa/two.pdf"},
+            {"Id": "ATT003", "path": "files/bb/three.pdf"},
+        ]
+
+        with patch("sfdump.retry.os.makedirs", wraps=os.makedirs) as makedirs:
+            retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
+
+        created = sorted(call.args[0] for call in makedirs.call_args_list)
+        assert created == [str(tmp_path / "files" / "aa"), str(tmp_path / "files" / "bb")]
+        assert (tmp_path / "files" / "bb").is_dir()
+
+    @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
+    def test_rows_written_before_rate_limit_are_kept(self, tmp_path):
+        """Results stream to the CSV, so a rate-limit stop keeps rows already done."""
+        mock_api = MagicMock()
+        mock_api.api_version = "v58.0"
+        mock_api.download_path_to_file.side_effect = RateLimitError("limit")
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+
+        rows = [{"Id": "ATT000", "path": ""}, {"Id": "ATT001", "path": "files/doc.pdf"}]
+
+        with pytest.raises(RateLimitError):
+            retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
+
+        with (links_dir / "attachments_missing_retry.csv").open() as f:
+            results = list(csv.DictReader(f))
+        assert [(r["Id"], r["retry_status"]) for r in results] == [("ATT000", "invalid-path")]
+
+    @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
+    def test_counts_invalid_and_failed_rows_as_missing(self, tmp_path):
+        """Only recovered rows are subtracted from the still-missing count."""
+        mock_api = MagicMock()
+        mock_api.api_version = "v58.0"
+
+        def download(url, _target):
+            if "ATT002" in url:
+                raise Exception("404 Not Found")
+
+        mock_api.download_path_to_file.side_effect = download
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+
+        rows = [
+            {"Id": "ATT000", "path": ""},
+            {"Id": "ATT001", "path": "files/one.pdf"},
+            {"Id": "ATT002", "path": "files/two.pdf"},
+        ]
+        assert retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir)) == 2
 
     @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
     def test_forbidden_error(self, tmp_path):
@@ -119,7 +349,9 @@ class TestRetryMissingAttachments:
 
         rows = [{"Id": "ATT001", "path": "files/doc.pdf"}]
 
-        retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
+        still_missing = retry_missing_attachments(mock_api, rows, str(tmp_path), str(links_dir))
+
+        assert still_missing == 1
 
         retry_csv = links_dir / "attachments_missing_retry.csv"
         with retry_csv.open() as f:
@@ -150,7 +382,8 @@ class TestRetryMissingAttachments:
         assert results[0]["retry_status"] == "not-found"
 
     @patch("sfdump.retry.tqdm", lambda x, **kwargs: x)
-    def test_connection_error(self, tmp_path):
+    @patch("sfdump.retry.time.sleep")
+    def test_connection_error(self, _sleep, tmp_path):
         """Handles connection error."""
         mock_api = MagicMock()
         mock_api.api_version = "v58.0"
@@ -344,3 +577,42 @@ class TestMergeRecoveredIntoMetadata:
         count = merge_recovered_into_metadata(str(original_csv), str(retry_csv))
 
         assert count == 0
+
+    def test_leaves_no_temp_file(self, tmp_path):
+        """Streaming rewrite cleans up its temp file whether or not rows change."""
+        original_csv = tmp_path / "attachments.csv"
+        original_csv.write_text("Id,path,sha256\nATT001,,abc123\nATT002,files/x.pdf,def\n")
+
+        retry_csv = tmp_path / "retry.csv"
+        retry_csv.write_text(
+            "Id,path,retry_status\nATT001,files/doc.pdf,recovered\nATT002,files/y.pdf,recovered\n"
+        )
+
+        assert merge_recovered_into_metadata(str(original_csv), str(retry_csv)) == 1
+        assert merge_recovered_into_metadata(str(original_csv), str(retry_csv)) == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["attachments.csv", "retry.csv"]
+
+    def test_missing_path_column_leaves_file_untouched(self, tmp_path):
+        """An original CSV without the path column is not rewritten."""
+        original_csv = tmp_path / "attachments.csv"
+        original_csv.write_text("Id,sha256\nATT001,abc123\n")
+
+        retry_csv = tmp_path / "retry.csv"
+        retry_csv.write_text("Id,path,retry_status\nATT001,files/doc.pdf,recovered\n")
+
+        assert merge_recovered_into_metadata(str(original_csv), str(retry_csv)) == 0
+        assert original_csv.read_text() == "Id,sha256\nATT001,abc123\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["attachments.csv", "retry.csv"]
+
+    def test_short_row_is_padded_when_patched(self, tmp_path):
+        """A ragged row whose path cell is absent still receives the recovered path."""
+        original_csv = tmp_path / "attachments.csv"
+        original_csv.write_text("Id,sha256,path\nATT001,abc123\n")
+
+        retry_csv = tmp_path / "retry.csv"
+        retry_csv.write_text("Id,path,retry_status\nATT001,files/doc.pdf,recovered\n")
+
+        assert merge_recovered_into_metadata(str(original_csv), str(retry_csv)) == 1
+        with original_csv.open() as f:
+            rows = list(csv.DictReader(f))
+        assert rows == [{"Id": "ATT001", "sha256": "abc123", "path": "files/doc.pdf"}]
@@ -318,6 +318,8 @@ class TestSalesforceAPIDownload:
         assert bytes_written == len(content)
         assert target.exists()
         assert target.read_bytes() == content
+        # Large chunks keep per-chunk Python overhead low on big files
+        mock_response.iter_content.assert_called_once_with(chunk_size=1024 * 1024)
 
 
 class TestSalesforceAPIRetry:
@@ -402,6 +404,99 @@ class TestSalesforceAPIRetry:
 
         assert result.status_code == 200
 
+    def test_reauthenticates_once_on_401(self):
+        """An expired token triggers one new login and the request is repeated."""
+        api = SalesforceAPI(SFConfig(client_id="id", client_secret="secret"))
+        api.access_token = "old"
+        api.instance_url = "https://myorg.my.salesforce.com"
+
+        expired = MagicMock()
+        expired.status_code = 401
+        ok = MagicMock()
+        ok.status_code = 200
+
+        def relogin():
+            api.access_token = "new"
+
+        with (
+            patch.object(api, "connect", side_effect=relogin) as connect,
+            patch.object(api.session, "request", side_effect=[expired, ok]) as request,
+        ):
+            assert api._get("https://example.com/test") is ok
+
+        connect.assert_called_once()
+        assert request.call_args_list[1].kwargs["headers"]["Authorization"] == "Bearer new"
+
+    def test_persistent_401_raises(self):
+        """A token that keeps failing raises HTTPError instead of re-authenticating forever."""
+        import threading
+
+        api = SalesforceAPI(SFConfig(client_id="id", client_secret="secret"))
+        logins = []
+
+        def login():
+            logins.append(1)
+            api.access_token = f"token{len(logins)}"
+            api.instance_url = "https://myorg.my.salesforce.com"
+
+        rejected = MagicMock()
+        rejected.status_code = 401
+        rejected.json.return_value = [{"errorCode": "INVALID_SESSION_ID"}]
+        rejected.raise_for_status.side_effect = requests.HTTPError("401 Unauthorized")
+        errors = []
+
+        def run():
+            try:
+                api.connect()
+            except requests.HTTPError as e:
+                errors.append(e)
+
+        with (
+            patch.object(api, "_client_credentials_login", side_effect=login),
+            patch.object(api.session, "request", return_value=rejected),
+        ):
+            worker = threading.Thread(target=run, daemon=True)
+            worker.start()
+            worker.join(timeout=5)
+
+        assert not worker.is_alive(), "connect() hung on a persistent 401"
+        assert len(errors) == 1
+        assert len(logins) == 2  # Initial login plus one re-authentication
+
+    def test_download_closes_rejected_response_when_reauth_fails(self, tmp_path):
+        """The 401 response is closed even if logging in again raises."""
+        api = SalesforceAPI(SFConfig(client_id="id", client_secret="secret"))
+        api.access_token = "old"
+        api.instance_url = "https://myorg.my.salesforce.com"
+
+        rejected = MagicMock()
+        rejected.status_code = 401
+
+        with (
+            patch.object(api, "connect", side_effect=RuntimeError("login failed")),
+            patch.object(api.session, "get", return_value=rejected),
+        ):
+            with pytest.raises(RuntimeError, match="login failed"):
+                api.download_path_to_file("/x", str(tmp_path / "f.bin"))
+
+        rejected.close.assert_called_once()
+
+    def test_configured_token_is_not_refreshed(self, connected_api):
+        """A 401 with a token from configuration raises without logging in again."""
+        expired = MagicMock()
+        expired.status_code = 401
+        expired.json.return_value = [{"errorCode": "INVALID_SESSION_ID"}]
+        expired.raise_for_status.side_effect = requests.HTTPError("401 Unauthorized")
+
+        with (
+            patch.object(connected_api, "connect") as connect,
+            patch.object(connected_api.session, "request", return_value=expired),
+        ):
+            with pytest.raises(requests.HTTPError):
+                connected_api._get("https://example.com/test")
+
+        connect.assert_not_called()
+
 
 class TestSalesforceAPILimits:
     """Tests for limits and whoami methods."""
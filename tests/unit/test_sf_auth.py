@@ -52,9 +52,9 @@ def test_get_salesforce_token_uses_cache(tmp_path, monkeypatch):
 
     # Fail loudly if requests.post is called (it shouldn't be)
     def fake_post(*args, **kwargs):  # pragma: no cover - should not be hit
-        raise AssertionError("requests.post should not be called when cache is valid")
+        raise AssertionError("no token request should be made when cache is valid")
 
-    monkeypatch.setattr(sf_auth.requests, "post", fake_post)
+    monkeypatch.setattr(sf_auth._SESSION, "post", fake_post)
 
     token = sf_auth.get_salesforce_token()
     assert token == "CACHED_TOKEN"
@@ -80,7 +80,7 @@ def test_get_salesforce_token_fetches_and_caches(tmp_path, monkeypatch):
             json_data={"access_token": "NEW_TOKEN", "expires_in": 1800},
         )
 
-    monkeypatch.setattr(sf_auth.requests, "post", fake_post)
+    monkeypatch.setattr(sf_auth._SESSION, "post", fake_post)
 
     token = sf_auth.get_salesforce_token()
 
@@ -110,7 +110,7 @@ def test_get_salesforce_token_http_error(tmp_path, monkeypatch):
     def fake_post(url, data=None, **kwargs):
         return DummyResponse(status_code=400, text="Bad request", json_data={"err": "x"})
 
-    monkeypatch.setattr(sf_auth.requests, "post", fake_post)
+    monkeypatch.setattr(sf_auth._SESSION, "post", fake_post)
 
     with pytest.raises(RuntimeError) as excinfo:
         sf_auth.get_salesforce_token()
@@ -120,6 +120,38 @@ def test_get_salesforce_token_http_error(tmp_path, monkeypatch):
     assert "Bad request" in msg
 
 
+def test_get_salesforce_token_memoized_in_process(tmp_path, monkeypatch):
+    """A valid token is served from memory without re-reading the cache file."""
+    cache_path = tmp_path / ".sfdump_token.json"
+    cache_path.write_text(
+        json.dumps({"access_token": "CACHED_TOKEN", "expires_at": time.time() + 3600})
+    )
+    monkeypatch.setattr(sf_auth, "CACHE_FILE", cache_path)
+
+    assert sf_auth.get_salesforce_token() == "CACHED_TOKEN"
+
+    cache_path.unlink()
+    assert sf_auth.get_salesforce_token() == "CACHED_TOKEN"
+
+
+def test_get_salesforce_token_memo_expires(tmp_path, monkeypatch):
+    """An expired in-memory token falls through to the disk/network path."""
+    cache_path = tmp_path / ".sfdump_token.json"
+    monkeypatch.setattr(sf_auth, "CACHE_FILE", cache_path)
+    monkeypatch.setattr(sf_auth, "_TOKEN_MEMO", (cache_path, "OLD", time.time() - 1))
+    monkeypatch.setenv("SF_LOGIN_URL", "https://example.my.salesforce.com")
+    monkeypatch.setenv("SF_CLIENT_ID", "cid")
+    monkeypatch.setenv("SF_CLIENT_SECRET", "secret")
+
+    def fake_post(url, data=None, **kwargs):
+        return DummyResponse(json_data={"access_token": "FRESH", "expires_in": 1800})
+
+    monkeypatch.setattr(sf_auth._SESSION, "post", fake_post)
+
+    assert sf_auth.get_salesforce_token() == "FRESH"
+    assert sf_auth._TOKEN_MEMO[1] == "FRESH"
+
+
 # ---- run_salesforce_query ---------------------------------------------------
 
 
@@ -133,21 +165,22 @@ def test_run_salesforce_query_success(monkeypatch):
 
     calls = {}
 
-    def fake_get(url, headers=None, **kwargs):
+    def fake_get(url, params=None, headers=None, **kwargs):
         calls["url"] = url
+        calls["params"] = params
         calls["headers"] = headers
         return DummyResponse(status_code=200, json_data={"totalSize": 1, "done": True})
 
-    monkeypatch.setattr(sf_auth.requests, "get", fake_get)
+    monkeypatch.setattr(sf_auth._SESSION, "get", fake_get)
 
     res = sf_auth.run_salesforce_query("SELECT Id FROM Account LIMIT 1")
 
     assert res["totalSize"] == 1
     # Ensure Authorization header and URL look correct
     assert calls["headers"]["Authorization"] == "Bearer ACCESS_TOKEN"
-    assert "/services/data/v60.0/query" in calls["url"]
-    # Spaces are encoded as %20 by urllib.parse.quote
-    assert "SELECT%20Id%20FROM%20Account%20LIMIT%201" in calls["url"]
+    assert calls["url"].endswith("/services/data/v60.0/query")
+    # The SOQL is passed raw; requests encodes it into the query string
+    assert calls["params"] == {"q": "SELECT Id FROM Account LIMIT 1"}
 
 
 def test_run_salesforce_query_error(monkeypatch):
@@ -163,7 +196,7 @@ def test_run_salesforce_query_error(monkeypatch):
             text="Internal Server Error",
         )
 
-    monkeypatch.setattr(sf_auth.requests, "get", fake_get)
+    monkeypatch.setattr(sf_auth._SESSION, "get", fake_get)
 
     with pytest.raises(RuntimeError) as excinfo:
         sf_auth.run_salesforce_query("SELECT Id FROM Account")
@@ -5,10 +5,16 @@ from __future__ import annotations
 import base64
 import hashlib
 import json
+import threading
 import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 from sfdump.sf_auth_web import (
+    CALLBACK_PATH,
+    _CallbackHandler,
     _generate_code_challenge,
     _generate_code_verifier,
     _load_cached_token,
@@ -58,6 +64,21 @@ class TestTokenPersistence:
             assert cached["access_token"] == "tok123"
             assert cached["refresh_token"] == "ref456"
 
+    def test_saved_token_served_from_memory(self, tmp_path):
+        token_file = tmp_path / "token.json"
+        with patch("sfdump.sf_auth_web.TOKEN_FILE", token_file):
+            _save_token({"access_token": "tok123"}, expires_in=3600)
+            token_file.unlink()
+            cached = _load_cached_token()
+            assert cached is not None
+            assert cached["access_token"] == "tok123"
+
+    def test_memory_copy_ignored_for_other_file(self, tmp_path):
+        with patch("sfdump.sf_auth_web.TOKEN_FILE", tmp_path / "a.json"):
+            _save_token({"access_token": "tok_a"}, expires_in=3600)
+        with patch("sfdump.sf_auth_web.TOKEN_FILE", tmp_path / "b.json"):
+            assert _load_cached_token() is None
+
     def test_load_expired_token_returns_none(self, tmp_path):
         token_file = tmp_path / "token.json"
         with patch("sfdump.sf_auth_web.TOKEN_FILE", token_file):
@@ -196,3 +217,38 @@ class TestGetWebToken:
             token = get_web_token()
             assert token == "interactive_tok"
             mock_login.assert_called_once()
+
+
+class TestCallbackHandler:
+    def _get(self, query: str) -> bool:
+        """Serve one callback request; return True if the handler stopped the server."""
+        _CallbackHandler.auth_code = None
+        _CallbackHandler.error = None
+        _CallbackHandler.done.clear()
+        server = ThreadingHTTPServer(("localhost", 0), _CallbackHandler)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05})
+        thread.start()
+        url = f"http://localhost:{server.server_port}{CALLBACK_PATH}?{query}"
+        try:
+            urllib.request.urlopen(url, timeout=5).read()
+        except urllib.error.HTTPError:
+            pass
+        thread.join(1)
+        stopped = not thread.is_alive()
+        server.shutdown()
+        server.server_close()
+        return stopped
+
+    def test_code_sets_done_event(self):
+        assert self._get("code=abc123") is True
+        assert _CallbackHandler.done.is_set()
+        assert _CallbackHandler.auth_code == "abc123"
+
+    def test_error_sets_done_event(self):
+        assert self._get("error=access_denied") is True
+        assert _CallbackHandler.done.is_set()
+        assert _CallbackHandler.error == "access_denied"
+
+    def test_missing_code_does_not_set_event(self):
+        assert self._get("state=xyz") is False
+        assert not _CallbackHandler.done.is_set()
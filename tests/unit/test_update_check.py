@@ -2,9 +2,28 @@
 
 from __future__ import annotations
 
+import json
+import time
 from unittest.mock import MagicMock, patch
 
-from sfdump.update_check import _parse_version, get_latest_release, is_update_available
+import pytest
+
+from sfdump import update_check
+from sfdump.update_check import (
+    _is_newer,
+    _parse_version,
+    get_latest_release,
+    is_update_available,
+)
+
+
+@pytest.fixture(autouse=True)
+def update_cache(tmp_path, monkeypatch):
+    """Point the release cache at a temp file so tests never share state."""
+    cache = tmp_path / "update_cache.json"
+    monkeypatch.setattr(update_check, "UPDATE_CACHE_FILE", cache)
+    return cache
+
 
 # ---------------------------------------------------------------------------
 # _parse_version
@@ -43,6 +62,23 @@ class TestParseVersion:
         assert _parse_version("2.7.0") < _parse_version("2.7.1")
 
 
+class TestIsNewer:
+    def test_release_newer_than_rc(self):
+        assert _is_newer("2.8.0", "2.8.0rc1") is True
+
+    def test_rc_newer_than_previous_release(self):
+        assert _is_newer("3.0.0rc1", "2.9.0") is True
+
+    def test_dev_build_ahead_of_release(self):
+        assert _is_newer("2.7.1", "2.7.2.dev5+g1234abc") is False
+
+    def test_post_release_not_older(self):
+        assert _is_newer("2.8.1", "2.8.1.post1") is False
+
+    def test_invalid_version_falls_back(self):
+        assert _is_newer("2.8.0", "2.7.x-custom") is True
+
+
 # ---------------------------------------------------------------------------
 # get_latest_release
 # ---------------------------------------------------------------------------
@@ -87,6 +123,50 @@ class TestGetLatestRelease:
         assert result is None
 
 
+class TestReleaseCache:
+    @patch("sfdump.update_check.requests.get")
+    def test_success_is_cached(self, mock_get, update_cache):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"info": {"version": "3.0.0"}}
+        mock_get.return_value = mock_resp
+
+        assert get_latest_release() == {"version": "3.0.0"}
+        assert get_latest_release() == {"version": "3.0.0"}
+
+        mock_get.assert_called_once()
+        assert json.loads(update_cache.read_text())["release"] == {"version": "3.0.0"}
+
+    @patch("sfdump.update_check.requests.get")
+    def test_expired_cache_refetches(self, mock_get, update_cache):
+        stale = time.time() - update_check.UPDATE_CACHE_TTL - 1
+        update_cache.write_text(json.dumps({"fetched_at": stale, "release": {"version": "1.0.0"}}))
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"info": {"version": "3.0.0"}}
+        mock_get.return_value = mock_resp
+
+        assert get_latest_release() == {"version": "3.0.0"}
+        mock_get.assert_called_once()
+
+    @patch("sfdump.update_check.requests.get")
+    def test_use_cache_false_bypasses_cache(self, mock_get, update_cache):
+        update_cache.write_text(
+            json.dumps({"fetched_at": time.time(), "release": {"version": "1.0.0"}})
+        )
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"info": {"version": "3.0.0"}}
+        mock_get.return_value = mock_resp
+
+        assert get_latest_release(use_cache=False) == {"version": "3.0.0"}
+        mock_get.assert_called_once()
+
+    @patch("sfdump.update_check.requests.get")
+    def test_failure_not_cached(self, mock_get, update_cache):
+        mock_get.side_effect = ConnectionError("no internet")
+
+        assert get_latest_release() is None
+        assert not update_cache.exists()
+
+
 # ---------------------------------------------------------------------------
 # is_update_available
 # ---------------------------------------------------------------------------
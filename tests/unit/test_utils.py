@@ -46,6 +46,15 @@ def test_sha256_of_file(tmp_path):
     )
 
 
+def test_sha256_of_file_spans_chunks(tmp_path):
+    import hashlib
+
+    data = bytes(range(256)) * 41  # 10,496 bytes: several full chunks plus a tail
+    p = tmp_path / "f.bin"
+    p.write_bytes(data)
+    assert sha256_of_file(str(p), chunk_size=1000) == hashlib.sha256(data).hexdigest()
+
+
 def test_write_csv_creates_and_orders_headers(tmp_path):
     rows = [{"b": 2, "a": 1}, {"a": 3, "b": 4, "c": 5}]
     f = tmp_path / "out.csv"
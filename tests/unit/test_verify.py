@@ -10,7 +10,9 @@ from sfdump.verify import (
     build_cfo_report,
     load_missing_csv,
     verify_attachments,
+    verify_attachments_rows,
     verify_content_versions,
+    verify_content_versions_rows,
 )
 
 
@@ -188,10 +190,12 @@ class TestVerifyAttachments:
         meta_csv = links_dir / "attachments_meta.csv"
         meta_csv.write_text("Id,path,sha256\nATT001,files/missing.pdf,abc123\n")
 
-        verify_attachments(str(meta_csv), str(tmp_path))
+        count, path = verify_attachments(str(meta_csv), str(tmp_path))
 
         missing_csv = links_dir / "attachments_missing.csv"
         assert missing_csv.exists()
+        assert count == 1
+        assert path == str(missing_csv)
 
     def test_creates_corrupt_csv(self, tmp_path):
         """Creates corrupt attachments CSV when SHA mismatch."""
@@ -227,8 +231,9 @@ class TestVerifyAttachments:
         meta_csv = links_dir / "attachments_meta.csv"
         meta_csv.write_text(f"Id,path,sha256\nATT001,files/doc.pdf,{sha}\n")
 
-        verify_attachments(str(meta_csv), str(tmp_path))
+        count, _ = verify_attachments(str(meta_csv), str(tmp_path))
 
+        assert count == 0
         # No missing or corrupt CSVs should be created
         missing_csv = links_dir / "attachments_missing.csv"
         corrupt_csv = links_dir / "attachments_corrupt.csv"
@@ -246,10 +251,42 @@ class TestVerifyContentVersions:
         meta_csv = links_dir / "content_versions_meta.csv"
         meta_csv.write_text("Id,path,sha256\nCV001,files/missing.pdf,abc123\n")
 
-        verify_content_versions(str(meta_csv), str(tmp_path))
+        count, path = verify_content_versions(str(meta_csv), str(tmp_path))
 
         missing_csv = links_dir / "content_versions_missing.csv"
         assert missing_csv.exists()
+        assert count == 1
+        assert path == str(missing_csv)
+
+
+class TestVerifyRowsFunctions:
+    """Tests for the verify_*_rows variants that return missing rows."""
+
+    def test_attachments_rows_returned_and_report_written(self, tmp_path):
+        """Missing rows come back in memory; the report CSV is still written."""
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+        meta_csv = links_dir / "attachments.csv"
+        meta_csv.write_text("Id,path,sha256\nATT001,files/missing.pdf,abc123\n")
+
+        rows = verify_attachments_rows(str(meta_csv), str(tmp_path))
+
+        assert [r["Id"] for r in rows] == ["ATT001"]
+        assert rows[0]["verify_error"] == "file-not-found"
+        assert (links_dir / "attachments_missing.csv").exists()
+
+    def test_content_versions_rows_empty_when_present(self, tmp_path):
+        """No rows and no report when every file is present."""
+        links_dir = tmp_path / "links"
+        links_dir.mkdir()
+        (tmp_path / "files").mkdir()
+        (tmp_path / "files" / "doc.pdf").write_bytes(b"content")
+        sha = hashlib.sha256(b"content").hexdigest()
+        meta_csv = links_dir / "content_versions.csv"
+        meta_csv.write_text(f"Id,path,sha256\nCV001,files/doc.pdf,{sha}\n")
+
+        assert verify_content_versions_rows(str(meta_csv), str(tmp_path)) == []
+        assert not (links_dir / "content_versions_missing.csv").exists()
 
 
 class TestLoadMissingCsv:
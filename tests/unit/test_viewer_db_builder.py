@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import sqlite3
 from pathlib import Path
 
@@ -80,3 +81,39 @@ def test_build_sqlite_from_export_creates_tables_and_rows(tmp_path: Path) -> Non
         assert index_names, "Expected at least one index to be created"
     finally:
         conn.close()
+
+
+def test_build_sqlite_applies_env_pragmas(tmp_path: Path, monkeypatch) -> None:
+    from sfdump.viewer.db_builder import _apply_env_pragmas
+
+    monkeypatch.setenv("SFDUMP_SQLITE_PRAGMA_JOURNAL", "wal")
+    monkeypatch.setenv("SFDUMP_SQLITE_PRAGMA_CACHE", "-2000")
+    monkeypatch.setenv("SFDUMP_SQLITE_PRAGMA_SYNC", "off; DROP TABLE x")
+
+    conn = sqlite3.connect(str(tmp_path / "t.db"))
+    try:
+        _apply_env_pragmas(conn, logging.getLogger("test"))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        # Invalid value is ignored, default (FULL=2) kept
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_build_sqlite_tolerates_ragged_rows(tmp_path: Path) -> None:
+    export_dir = tmp_path / "export"
+    (export_dir / "csv").mkdir(parents=True)
+    (export_dir / "csv" / "Account.csv").write_text(
+        "Id,Name,Type\n001A,Acme\n001B,Beta,Customer,extra\n", encoding="utf-8"
+    )
+
+    db_path = tmp_path / "sfdata.db"
+    build_sqlite_from_export(export_dir, db_path)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute('SELECT "Id", "Name", "Type" FROM account ORDER BY "Id"').fetchall()
+        assert rows == [("001A", "Acme", ""), ("001B", "Beta", "Customer")]
+    finally:
+        conn.close()